@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 import csv
 import io
-from ...core.database import get_db
+from ...core.database import get_db, get_async_db
 from ...services.alert_service import AlertService
 from ...schemas.alert import AlertResponse, AcknowledgeRequest, ResolveRequest
 
@@ -62,7 +63,7 @@ async def resolve_alerts(
     return {"message": "Alerts resolved successfully"}
 
 @router.post("/sync")
-async def sync_alerts(db: Session = Depends(get_db)):
+async def sync_alerts(db: AsyncSession = Depends(get_async_db)):
     """Manually trigger alert sync"""
     await alert_service.sync_alerts(db)
     return {"message": "Alert sync completed"}
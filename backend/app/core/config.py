@@ -91,6 +91,8 @@ class Settings(BaseSettings):
     MATCHING_PROCESSING_TIMEOUT_SECONDS: int = 300
     ENABLE_MATCHING_CACHE: bool = True
     MATCHING_CACHE_TTL_MINUTES: int = 30
+    MATCHING_CACHE_DIR: str = "/tmp/alert-manager/matching-cache"
+    MATCH_PARALLEL_THRESHOLD: int = 200             # Score in a process pool above this many source alerts
     
     # Logging and Debugging (NEW)
     LOG_MATCHING_DETAILS: bool = True
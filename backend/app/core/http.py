@@ -0,0 +1,27 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional
+
+_session: Optional[requests.Session] = None
+
+def get_http_session() -> requests.Session:
+    """Return the process-wide pooled HTTP session, creating it on first use."""
+    global _session
+    if _session is None:
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+        )
+        _session = requests.Session()
+        _session.mount('http://', adapter)
+        _session.mount('https://', adapter)
+    return _session
+
+def close_http_session():
+    """Release the pooled connections (called on shutdown)."""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
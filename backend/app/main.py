@@ -2,8 +2,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
 from .core.database import engine, Base
+from .core.http import close_http_session
 from .api.routes import alerts, config
 from .services.jsm_service import JSMService
+from .services.matching_service import shutdown_match_pool
 import logging
 import asyncio
 
@@ -157,11 +159,20 @@ async def shutdown_event():
     
     if global_scheduler:
         try:
-            global_scheduler.scheduler.shutdown()
+            global_scheduler.shutdown()
+            await global_scheduler.alert_service.prometheus_service.close()
             logger.info("✅ Scheduler stopped")
         except Exception as e:
             logger.error(f"❌ Error stopping scheduler: {e}")
     
+    try:
+        await alerts.alert_service.prometheus_service.close()
+    except Exception as e:
+        logger.error(f"❌ Error closing Prometheus HTTP session: {e}")
+    
+    close_http_session()
+    shutdown_match_pool()
+    
     logger.info("👋 Shutdown complete")
 
 def get_global_scheduler():
@@ -208,7 +219,7 @@ async def health_check():
     
     # Add scheduler status
     if global_scheduler:
-        health_status["scheduler"] = "running" if global_scheduler.scheduler.running else "stopped"
+        health_status["scheduler"] = "running" if global_scheduler.running else "stopped"
     else:
         health_status["scheduler"] = "not_initialized"
     
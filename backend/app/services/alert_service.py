@@ -1,6 +1,9 @@
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from ..models.alert import Alert
 from ..schemas.alert import AlertCreate, AlertUpdate
 from .grafana_service import GrafanaService
@@ -12,6 +15,12 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def _to_db_datetime(value: datetime) -> datetime:
+    """Alert timestamp columns hold naive UTC; convert tz-aware values before storing"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
 class AlertService:
     def __init__(self):
         self.grafana_service = GrafanaService()
@@ -30,6 +39,8 @@ class AlertService:
                     sanitized[key] = None
             elif isinstance(value, str):
                 sanitized[key] = value.strip() if value else ""
+            elif isinstance(value, datetime):
+                sanitized[key] = _to_db_datetime(value)
             else:
                 sanitized[key] = value
         return sanitized
@@ -53,7 +64,7 @@ class AlertService:
         
         return False
     
-    async def sync_alerts(self, db: Session):
+    async def sync_alerts(self, db: AsyncSession):
         """Sync alerts from all sources (Grafana, Prometheus) and JSM, then match them"""
         try:
             logger.info("🔄 Starting alert synchronization with all sources and JSM")
@@ -64,7 +75,7 @@ class AlertService:
             # Combine all source alerts into a single list
             source_alerts = grafana_alerts + prometheus_alerts
             # Fetch JSM alerts
-            jsm_alerts = await self.jsm_service.get_jsm_alerts(limit=settings.JSM_ALERTS_LIMIT)
+            jsm_alerts = await self.jsm_service.get_jsm_alerts_batched(settings.JSM_ALERTS_LIMIT)
             
             logger.info(f"📊 Retrieved {len(source_alerts)} source alerts ({len(grafana_alerts)} Grafana, {len(prometheus_alerts)} Prometheus) and {len(jsm_alerts)} JSM alerts")
     
@@ -88,11 +99,18 @@ class AlertService:
             # Track active Grafana alert IDs
             active_grafana_alert_ids = set()
             processed_jsm_ids = set()
+            new_alerts = []
+            
+            sanitized_alerts = [self._sanitize_alert_data(m['grafana_alert']) for m in matched_alerts]
+            
+            # Load all existing alerts up front instead of one query per alert
+            existing_by_alert_id = await self._load_alerts_by(
+                db, Alert.alert_id, {a.get('alert_id') for a in sanitized_alerts if a.get('alert_id')}
+            )
 
             # Process matched alerts
-            for match_info in matched_alerts:
+            for match_info, grafana_alert in zip(matched_alerts, sanitized_alerts):
                 try:
-                    grafana_alert = self._sanitize_alert_data(match_info['grafana_alert'])
                     jsm_alert = match_info.get('jsm_alert')
                     
                     alert_id = grafana_alert.get('alert_id')
@@ -105,8 +123,8 @@ class AlertService:
                         processed_jsm_ids.add(jsm_alert['id'])
 
                     
-                    # Check if alert exists in DB
-                    existing_alert = db.query(Alert).filter(Alert.alert_id == alert_id).first()
+                    # Check if alert exists in DB (or was created earlier in this sync)
+                    existing_alert = existing_by_alert_id.get(alert_id)
                     
                     if existing_alert:
                         # Update existing alert
@@ -114,25 +132,32 @@ class AlertService:
                         logger.debug(f"🔄 Updated existing alert {alert_id}")
                     else:
                         # Create new alert
-                        new_alert = self._create_new_alert(db, grafana_alert, jsm_alert, match_info)
+                        new_alert = self._create_new_alert(grafana_alert, jsm_alert, match_info)
                         if new_alert:
+                            new_alerts.append(new_alert)
+                            existing_by_alert_id[alert_id] = new_alert
                             match_status = "✅ with JSM match" if jsm_alert else "❌ no JSM match"
                             logger.info(f"➕ Created new alert {alert_id} {match_status}")
                         
                 except Exception as e:
                     logger.error(f"❌ Error processing alert: {e}")
                     continue
+            
+            # Insert all new alerts with batched upserts
+            await self._upsert_new_alerts(db, new_alerts)
 
             # Create records for JSM alerts that were not matched to any Grafana alert
-            for jsm_alert in jsm_alerts:
-                jsm_id = jsm_alert.get('id')
-                if jsm_id and jsm_id not in processed_jsm_ids:
-                    existing_jsm_alert = db.query(Alert).filter(Alert.jsm_alert_id == jsm_id).first()
-                    if not existing_jsm_alert:
-                        self._create_jsm_only_alert(db, jsm_alert)
-                    else:
-                        # If it exists but wasn't matched, it might be an old record. Update it.
-                        self._update_jsm_fields(existing_jsm_alert, jsm_alert, {'match_type': 'jsm_only', 'match_confidence': 0})
+            unmatched_jsm_alerts = [a for a in jsm_alerts if a.get('id') and a['id'] not in processed_jsm_ids]
+            existing_by_jsm_id = await self._load_alerts_by(
+                db, Alert.jsm_alert_id, {a['id'] for a in unmatched_jsm_alerts}
+            )
+            for jsm_alert in unmatched_jsm_alerts:
+                existing_jsm_alert = existing_by_jsm_id.get(jsm_alert['id'])
+                if not existing_jsm_alert:
+                    existing_by_jsm_id[jsm_alert['id']] = self._create_jsm_only_alert(db, jsm_alert)
+                else:
+                    # If it exists but wasn't matched, it might be an old record. Update it.
+                    self._update_jsm_fields(existing_jsm_alert, jsm_alert, {'match_type': 'jsm_only', 'match_confidence': 0})
             
             # Mark resolved alerts (Grafana alerts no longer active)
             await self._mark_resolved_alerts(db, active_grafana_alert_ids)
@@ -140,24 +165,76 @@ class AlertService:
             # Update JSM status for existing alerts without current matches
             await self._update_orphaned_jsm_alerts(db, jsm_alerts)
             
-            db.commit()
+            await db.commit()
             logger.info("✅ Alert synchronization completed successfully")
             
             # Log summary statistics
-            total_alerts = db.query(Alert).count()
-            matched_alerts_count = db.query(Alert).filter(Alert.jsm_alert_id.isnot(None)).count()
+            total_alerts = await db.scalar(select(func.count()).select_from(Alert))
+            matched_alerts_count = await db.scalar(
+                select(func.count()).select_from(Alert).where(Alert.jsm_alert_id.isnot(None))
+            )
             logger.info(f"📈 Database summary: {total_alerts} total alerts, {matched_alerts_count} with JSM matches")
             
         except Exception as e:
             logger.error(f"❌ Critical error in sync_alerts: {e}")
-            db.rollback()
+            await db.rollback()
             raise
 
-    def _create_jsm_only_alert(self, db: Session, jsm_data: Dict[str, Any]):
+    async def _load_alerts_by(self, db: AsyncSession, column, values: set) -> Dict[str, Alert]:
+        """Load alerts whose column value is in values, using IN queries of BATCH_SIZE_ALERTS."""
+        values = list(values)
+        batch_size = settings.BATCH_SIZE_ALERTS
+        alerts_by_value = {}
+        
+        for start in range(0, len(values), batch_size):
+            result = await db.execute(select(Alert).where(column.in_(values[start:start + batch_size])))
+            for alert in result.scalars():
+                alerts_by_value.setdefault(getattr(alert, column.key), alert)
+        
+        return alerts_by_value
+
+    async def _upsert_new_alerts(self, db: AsyncSession, new_alerts: List[Alert]):
+        """
+        Insert new alerts with INSERT ... ON CONFLICT (alert_id) DO UPDATE, BATCH_SIZE_ALERTS rows per statement.
+        
+        A concurrent sync may have inserted the same alert_id after existing rows were
+        loaded; that row is then updated with this sync's data instead of failing the sync.
+        Manual acknowledgement/resolution and created_at are never overwritten.
+        """
+        if not new_alerts:
+            return
+        
+        columns = [column for column in Alert.__table__.columns if column.key != 'id']
+        rows = [self._alert_row(alert, columns) for alert in new_alerts]
+        preserved = {'alert_id', 'created_at', 'acknowledged_by', 'acknowledged_at', 'resolved_by', 'resolved_at'}
+        batch_size = settings.BATCH_SIZE_ALERTS
+        
+        for start in range(0, len(rows), batch_size):
+            stmt = pg_insert(Alert).values(rows[start:start + batch_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Alert.alert_id],
+                set_={
+                    **{column.key: stmt.excluded[column.key] for column in columns if column.key not in preserved},
+                    'updated_at': func.now()
+                }
+            )
+            await db.execute(stmt)
+    
+    def _alert_row(self, alert: Alert, columns) -> Dict[str, Any]:
+        """Column values of an unsaved Alert, with column defaults filled in for unset fields."""
+        row = {}
+        for column in columns:
+            value = getattr(alert, column.key)
+            if value is None and column.default is not None and (column.default.is_scalar or column.default.is_clause_element):
+                value = column.default.arg
+            row[column.key] = value
+        return row
+
+    def _create_jsm_only_alert(self, db: AsyncSession, jsm_data: Dict[str, Any]) -> Optional[Alert]:
         """Create an alert record for a JSM alert that has no Grafana match."""
         jsm_id = jsm_data.get('id')
         if not jsm_id:
-            return
+            return None
 
         jsm_status_info = self.jsm_service.get_alert_status_info(jsm_data)
         alert_name = self.jsm_service.extract_alert_name_from_jsm(jsm_data) or jsm_status_info.get('message', 'JSM Alert')
@@ -176,6 +253,7 @@ class AlertService:
         self._update_jsm_fields(new_alert, jsm_data, {'match_type': 'jsm_only', 'match_confidence': 0})
         db.add(new_alert)
         logger.info(f"Created new record for JSM-only alert: {jsm_id}")
+        return new_alert
     
     def _update_existing_alert(self, alert: Alert, grafana_data: Dict, jsm_data: Optional[Dict], match_info: Dict):
         """Update existing alert with latest data"""
@@ -204,8 +282,8 @@ class AlertService:
             alert.match_type = 'none'
             alert.match_confidence = 0
     
-    def _create_new_alert(self, db: Session, grafana_data: Dict, jsm_data: Optional[Dict], match_info: Dict) -> Optional[Alert]:
-        """Create new alert in database"""
+    def _create_new_alert(self, grafana_data: Dict, jsm_data: Optional[Dict], match_info: Dict) -> Optional[Alert]:
+        """Build a new alert row (the caller adds it to the session)"""
         try:
             # Create base alert from Grafana data
             new_alert = Alert(
@@ -224,9 +302,6 @@ class AlertService:
                 new_alert.match_confidence = 0
                 logger.debug(f"➕ Created new alert without JSM match: {new_alert.alert_id}")
             
-            db.add(new_alert)
-            db.flush()  # Get the ID
-            
             return new_alert
             
         except Exception as e:
@@ -255,17 +330,17 @@ class AlertService:
             # Parse JSM timestamps
             try:
                 if jsm_status_info['created_at']:
-                    alert.jsm_created_at = datetime.fromisoformat(
+                    alert.jsm_created_at = _to_db_datetime(datetime.fromisoformat(
                         jsm_status_info['created_at'].replace('Z', '+00:00')
-                    )
+                    ))
                 if jsm_status_info['updated_at']:
-                    alert.jsm_updated_at = datetime.fromisoformat(
+                    alert.jsm_updated_at = _to_db_datetime(datetime.fromisoformat(
                         jsm_status_info['updated_at'].replace('Z', '+00:00')
-                    )
+                    ))
                 if jsm_status_info['last_occurred_at']:
-                    alert.jsm_last_occurred_at = datetime.fromisoformat(
+                    alert.jsm_last_occurred_at = _to_db_datetime(datetime.fromisoformat(
                         jsm_status_info['last_occurred_at'].replace('Z', '+00:00')
-                    )
+                    ))
             except Exception as e:
                 logger.warning(f"⚠️  Error parsing JSM timestamps: {e}")
             
@@ -290,13 +365,15 @@ class AlertService:
         }
         return mapping.get(jsm_status, 'open')
     
-    async def _mark_resolved_alerts(self, db: Session, active_alert_ids: set):
+    async def _mark_resolved_alerts(self, db: AsyncSession, active_alert_ids: set):
         """Mark alerts as resolved if they're no longer active in Grafana"""
         try:
-            resolved_alerts = db.query(Alert).filter(
-                ~Alert.alert_id.in_(active_alert_ids),
-                Alert.grafana_status == "active"
-            ).all()
+            resolved_alerts = (await db.execute(
+                select(Alert).where(
+                    ~Alert.alert_id.in_(active_alert_ids),
+                    Alert.grafana_status == "active"
+                )
+            )).scalars().all()
             
             if resolved_alerts:
                 logger.info(f"🔄 Found {len(resolved_alerts)} alerts to mark as resolved")
@@ -327,15 +404,15 @@ class AlertService:
         except Exception as e:
             logger.error(f"❌ Error marking resolved alerts: {e}")
     
-    async def _update_orphaned_jsm_alerts(self, db: Session, jsm_alerts: List[Dict]):
+    async def _update_orphaned_jsm_alerts(self, db: AsyncSession, jsm_alerts: List[Dict]):
         """Update alerts that have JSM IDs but may have status changes"""
         try:
             jsm_alerts_by_id = {alert['id']: alert for alert in jsm_alerts}
             
             # Find alerts with JSM IDs
-            alerts_with_jsm = db.query(Alert).filter(
-                Alert.jsm_alert_id.isnot(None)
-            ).all()
+            alerts_with_jsm = (await db.execute(
+                select(Alert).where(Alert.jsm_alert_id.isnot(None))
+            )).scalars().all()
             
             updated_count = 0
             for alert in alerts_with_jsm:
@@ -1,28 +1,34 @@
+import asyncio
+import orjson
 import requests
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from ..core.config import settings
+from ..core.http import get_http_session
 
 logger = logging.getLogger(__name__)
 
 class GrafanaService:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         self.base_url = settings.GRAFANA_API_URL
         self.api_key = settings.GRAFANA_API_KEY
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # Callers can pass a session to share its connection pool; defaults to the process-wide one
+        self.session = session or get_http_session()
     
     async def get_active_alerts(self) -> List[Dict[str, Any]]:
         """Fetch all active alerts from Grafana"""
         try:
             url = f"{self.base_url}/api/alertmanager/grafana/api/v2/alerts"
-            response = requests.get(url, headers=self.headers, timeout=30)
+            # Blocking HTTP runs in a worker thread so concurrent callers overlap
+            response = await asyncio.to_thread(self.session.get, url, headers=self.headers, timeout=30)
             response.raise_for_status()
             
-            alerts = response.json()
+            alerts = orjson.loads(response.content)
             active_alerts = []
             
             for alert in alerts:
@@ -33,7 +39,7 @@ class GrafanaService:
             logger.info(f"Found {len(active_alerts)} active alerts in Grafana")
             return active_alerts
             
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Error fetching alerts from Grafana: {e}")
             return []
     
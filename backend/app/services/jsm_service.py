@@ -1,17 +1,133 @@
+import asyncio
 import requests
 import logging
 import base64
 import hashlib
+import json
+import orjson
+import os
 import re
+import tempfile
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from ..core.config import settings
+from ..core.http import get_http_session
 
 logger = logging.getLogger(__name__)
 
+# Cloud IDs resolved from tenant_info, shared by every JSMService in the process:
+# (tenant URL, user email) -> (resolved at, cloud ID)
+_CLOUD_ID_CACHE: Dict[Tuple[str, str], Tuple[float, str]] = {}
+_CLOUD_ID_TTL_SECONDS = 3600
+# Persisted copy of the cache, so short-lived processes (deploy probes, CI runs) skip the
+# lookup too. It lives in the per-user cache directory (0700 dir, 0600 file) because its
+# content decides the API URL; it is only consulted when JSM_CLOUD_ID is not configured
+_CLOUD_ID_CACHE_FILE = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'alert-manager', 'jsm_cloudid.json'
+)
+# Atlassian cloud IDs are UUIDs; anything else in the file is ignored
+_CLOUD_ID_RE = re.compile(r'^[0-9a-fA-F-]{36}$')
+
+def _read_cloud_id_file() -> Dict[str, Any]:
+    """Load the persisted cache, ignoring it unless it is private to the current user"""
+    try:
+        with open(_CLOUD_ID_CACHE_FILE, 'r') as f:
+            file_stat = os.fstat(f.fileno())
+            if file_stat.st_uid != os.getuid() or file_stat.st_mode & 0o077:
+                logger.warning(f"Ignoring Cloud ID cache with unsafe ownership or permissions: {_CLOUD_ID_CACHE_FILE}")
+                return {}
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+def _load_cached_cloud_id(cache_key: Tuple[str, str]) -> Optional[str]:
+    """Return a fresh cloud ID for cache_key from memory, falling back to the cache file"""
+    cached = _CLOUD_ID_CACHE.get(cache_key)
+    if cached is None:
+        entry = _read_cloud_id_file().get('|'.join(cache_key))
+        try:
+            resolved_at, cloud_id = float(entry[0]), str(entry[1])
+        except (TypeError, ValueError, IndexError, KeyError):
+            return None
+        if not _CLOUD_ID_RE.match(cloud_id):
+            return None
+        cached = _CLOUD_ID_CACHE[cache_key] = (resolved_at, cloud_id)
+    
+    if time.time() - cached[0] < _CLOUD_ID_TTL_SECONDS:
+        return cached[1]
+    return None
+
+def _store_cached_cloud_id(cache_key: Tuple[str, str], cloud_id: str):
+    """Remember a resolved cloud ID in memory and in the cache file (written atomically)"""
+    _CLOUD_ID_CACHE[cache_key] = (time.time(), cloud_id)
+    entries = {'|'.join(key): list(value) for key, value in _CLOUD_ID_CACHE.items()}
+    try:
+        cache_dir = os.path.dirname(_CLOUD_ID_CACHE_FILE)
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        # mkstemp creates the file with mode 0600
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix='.jsm_cloudid.')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, _CLOUD_ID_CACHE_FILE)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not persist Cloud ID cache: {e}")
+
+# Extraction patterns, compiled once at import; tried in order
+_MESSAGE_NAME_PATTERNS = tuple(re.compile(p) for p in (
+    r'\[Grafana\]:\s*\*[^*]+\*:\s*([^\s\n]+)',
+    r'\*Summary\*:\s*([^\s\n*]+)',
+    r'Alert:\s*([A-Za-z0-9\-_]+)',
+    r'^([A-Za-z0-9\-_]{3,})',  # Start of message if it looks like alert name
+))
+_K8S_NAME_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(pod-[a-z0-9\-]+)',
+    r'(container-[a-z0-9\-]+)',
+    r'([a-z0-9\-]+prometheus[a-z0-9\-]*)',
+    r'([a-z0-9\-]+metrics[a-z0-9\-]*)',
+))
+_DESCRIPTION_NAME_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Alert:\s*([A-Za-z0-9\-_]+)',
+    r'AlertName:\s*([A-Za-z0-9\-_]+)',
+    r'Rule:\s*([A-Za-z0-9\-_]+)',
+))
+_CLUSTER_TAG_RE = re.compile(r'([a-zA-Z0-9\-_]*(?:prod|staging|dev|test)[a-zA-Z0-9\-_]*)', re.IGNORECASE)
+_MESSAGE_CLUSTER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'cluster[:\s]+([a-zA-Z0-9\-_]+)',
+    r'datanode-\d+-([a-zA-Z0-9\-_]+)',
+    r'([a-zA-Z0-9\-_]+)-cloud-',
+    r'in\s+([a-zA-Z0-9\-_]+)\s+cluster',
+))
+# Pattern: datanode-21-pro-cloud-shared-aws-us-east-1
+_INSTANCE_CLUSTER_PATTERNS = tuple(re.compile(p) for p in (
+    r'^([a-zA-Z0-9\-_]+)-cloud-',  # Extract before '-cloud-'
+    r'^([a-zA-Z0-9\-_]+)-\d+-',    # Extract before number
+    r'^([a-zA-Z]+)',               # Just the first word
+))
+_GENERIC_NAME_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'^(alert|error|warning|info|debug|message|notification)$',
+    r'^\d+$',  # Just numbers
+    r'^[^a-zA-Z]*$',  # No letters
+    r'^(the|and|or|but|in|on|at|to|for|of|with|by)$',  # Common words
+))
+_ALNUM_RE = re.compile(r'[a-zA-Z0-9]')
+_CLUSTER_NAME_CHARS_RE = re.compile(r'^[a-zA-Z0-9\-_]+$')
+# Common cluster name terms
+_CLUSTER_INDICATOR_RE = re.compile(
+    r'(prod|production|staging|stage|dev|development|test|testing)'
+    r'|(cluster|k8s|kubernetes)'
+    r'|(east|west|north|south|us|eu|asia)'
+    r'|(aws|azure|gcp|cloud)'
+)
+
 class JSMService:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         self.base_url = "https://api.atlassian.com/jsm/ops/api"
         self.tenant_url = settings.JIRA_URL  # e.g., https://devoinc.atlassian.net
         self.user_email = settings.JIRA_USER_EMAIL
@@ -28,22 +144,25 @@ class JSMService:
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
+        # Callers can pass a session to share its connection pool; defaults to the process-wide one
+        self.session = session or get_http_session()
         
         # Rate limiting
         self.last_request_time = 0
         self.min_request_interval = 60 / getattr(settings, 'JSM_RATE_LIMIT_PER_MINUTE', 500)
     
-    def _rate_limit(self):
+    async def _rate_limit(self):
         """Implement rate limiting for JSM API calls"""
+        # Reserve the next request slot before sleeping, so concurrent callers
+        # queue up behind each other instead of all waking at the same time
         current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        slot = max(current_time, self.last_request_time + self.min_request_interval)
+        self.last_request_time = slot
         
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
+        sleep_time = slot - current_time
+        if sleep_time > 0:
             logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+            await asyncio.sleep(sleep_time)
     
     def _safe_str(self, value: Any) -> str:
         """Safely convert any value to string, handling None values"""
@@ -59,26 +178,34 @@ class JSMService:
     
     async def get_cloud_id(self) -> Optional[str]:
         """Retrieve Atlassian Cloud ID from tenant info"""
+        # A configured JSM_CLOUD_ID always wins; the caches only back tenant_info lookups
         if self.cloud_id:
             return self.cloud_id
+        
+        cache_key = (self.tenant_url, self.user_email)
+        cached_cloud_id = _load_cached_cloud_id(cache_key)
+        if cached_cloud_id:
+            self.cloud_id = cached_cloud_id
+            return self.cloud_id
             
         try:
-            self._rate_limit()
+            await self._rate_limit()
             url = f"{self.tenant_url}/_edge/tenant_info"
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = await asyncio.to_thread(self.session.get, url, headers=self.headers, timeout=30)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             self.cloud_id = data.get('cloudId')
             
             if self.cloud_id:
+                _store_cached_cloud_id(cache_key, self.cloud_id)
                 logger.info(f"Retrieved Cloud ID: {self.cloud_id}")
                 return self.cloud_id
             else:
                 logger.error("Cloud ID not found in tenant info")
                 return None
                 
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Error retrieving Cloud ID: {e}")
             return None
     
@@ -90,7 +217,7 @@ class JSMService:
                 logger.error("Cannot fetch JSM alerts without Cloud ID")
                 return []
             
-            self._rate_limit()
+            await self._rate_limit()
             url = f"{self.base_url}/{cloud_id}/v1/alerts"
             params = {
                 "limit": min(limit, 100),  # JSM API limit
@@ -99,15 +226,16 @@ class JSMService:
                 "order": "desc"
             }
             
-            response = requests.get(
-                url, 
+            response = await asyncio.to_thread(
+                self.session.get,
+                url,
                 headers=self.headers, 
                 params=params,
                 timeout=getattr(settings, 'JSM_API_TIMEOUT', 30)
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             alerts = data.get('values', [])
             
             logger.info(f"Retrieved {len(alerts)} JSM alerts from API")
@@ -119,14 +247,46 @@ class JSMService:
             
             return alerts
             
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Error fetching JSM alerts: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 logger.error(f"Response status: {e.response.status_code}")
                 logger.error(f"Response content: {e.response.text}")
             return []
     
-    def extract_alert_name_from_jsm(self, jsm_alert: Dict[str, Any]) -> Optional[str]:
+    async def get_jsm_alerts_batched(self, total_limit: int, page_size: int = 100,
+                                     max_concurrency: int = 10) -> List[Dict[str, Any]]:
+        """Fetch up to total_limit alerts as concurrent page requests (newest first)"""
+        # Resolve the Cloud ID once up front instead of in every page request
+        if not await self.get_cloud_id():
+            logger.error("Cannot fetch JSM alerts without Cloud ID")
+            return []
+        
+        page_size = min(page_size, 100)  # JSM API limit
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch_page(offset: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_jsm_alerts(limit=min(page_size, total_limit - offset), offset=offset)
+        
+        pages = await asyncio.gather(*(fetch_page(offset) for offset in range(0, total_limit, page_size)))
+        
+        # Alerts created while pages are in flight shift the offsets, so the same
+        # alert can appear on two adjacent pages
+        alerts = []
+        seen_ids = set()
+        for page in pages:
+            for alert in page:
+                alert_id = alert.get('id')
+                if alert_id in seen_ids:
+                    continue
+                seen_ids.add(alert_id)
+                alerts.append(alert)
+        
+        return alerts
+    
+    def extract_alert_name_from_jsm(self, jsm_alert: Dict[str, Any],
+                                    cache: Optional[Dict[str, Optional[str]]] = None) -> Optional[str]:
         """
         Extract alert name from JSM alert with multiple fallback strategies.
         
@@ -135,7 +295,20 @@ class JSMService:
         2. Parse from message field 
         3. Use alias field
         4. Extract from description using patterns
+        
+        If `cache` is given, results are memoized in it by JSM alert id.
         """
+        if cache is None:
+            return self._extract_alert_name_from_jsm(jsm_alert)
+        
+        alert_id = jsm_alert.get('data', jsm_alert).get('id')
+        if alert_id is None:
+            return self._extract_alert_name_from_jsm(jsm_alert)
+        if alert_id not in cache:
+            cache[alert_id] = self._extract_alert_name_from_jsm(jsm_alert)
+        return cache[alert_id]
+    
+    def _extract_alert_name_from_jsm(self, jsm_alert: Dict[str, Any]) -> Optional[str]:
         try:
             # Handle nested data structure if present
             alert_data = jsm_alert.get('data', jsm_alert)
@@ -154,15 +327,8 @@ class JSMService:
             if message:
                 # Look for Grafana-style message format
                 # Pattern: [Grafana]: *Summary*: AlertName
-                grafana_patterns = [
-                    r'\[Grafana\]:\s*\*[^*]+\*:\s*([^\s\n]+)',
-                    r'\*Summary\*:\s*([^\s\n*]+)',
-                    r'Alert:\s*([A-Za-z0-9\-_]+)',
-                    r'^([A-Za-z0-9\-_]{3,})',  # Start of message if it looks like alert name
-                ]
-                
-                for pattern in grafana_patterns:
-                    match = re.search(pattern, message)
+                for pattern in _MESSAGE_NAME_PATTERNS:
+                    match = pattern.search(message)
                     if match:
                         candidate = match.group(1).strip()
                         if self._is_valid_alert_name(candidate):
@@ -170,15 +336,8 @@ class JSMService:
                             return candidate
                 
                 # Fallback: Look for kubernetes/prometheus patterns
-                k8s_patterns = [
-                    r'(pod-[a-z0-9\-]+)',
-                    r'(container-[a-z0-9\-]+)',
-                    r'([a-z0-9\-]+prometheus[a-z0-9\-]*)',
-                    r'([a-z0-9\-]+metrics[a-z0-9\-]*)',
-                ]
-                
-                for pattern in k8s_patterns:
-                    match = re.search(pattern, message, re.IGNORECASE)
+                for pattern in _K8S_NAME_PATTERNS:
+                    match = pattern.search(message)
                     if match:
                         candidate = match.group(1)
                         if self._is_valid_alert_name(candidate):
@@ -194,13 +353,8 @@ class JSMService:
             # Strategy 4: Extract from description
             description = self._safe_str(alert_data.get('description', '')).strip()
             if description:
-                desc_patterns = [
-                    r'Alert:\s*([A-Za-z0-9\-_]+)',
-                    r'AlertName:\s*([A-Za-z0-9\-_]+)',
-                    r'Rule:\s*([A-Za-z0-9\-_]+)',
-                ]
-                for pattern in desc_patterns:
-                    match = re.search(pattern, description, re.IGNORECASE)
+                for pattern in _DESCRIPTION_NAME_PATTERNS:
+                    match = pattern.search(description)
                     if match:
                         candidate = match.group(1).strip()
                         if self._is_valid_alert_name(candidate):
@@ -246,30 +400,32 @@ class JSMService:
                             return cluster
                     
                     # Look for cluster patterns in other tags
-                    cluster_match = re.search(r'([a-zA-Z0-9\-_]*(?:prod|staging|dev|test)[a-zA-Z0-9\-_]*)', tag, re.IGNORECASE)
+                    cluster_match = _CLUSTER_TAG_RE.search(tag)
                     if cluster_match:
                         cluster = cluster_match.group(1)
                         if self._looks_like_cluster_name(cluster):
                             logger.debug(f"Extracted cluster from tag pattern: {cluster}")
                             return cluster
             
-            # Strategy 2: Extract from message
+            # Strategy 2: Check the alert's extra properties
+            details = alert_data.get('details')
+            if isinstance(details, dict):
+                cluster = self._safe_str(details.get('cluster', '')).strip()
+                if cluster and self._looks_like_cluster_name(cluster):
+                    logger.debug(f"Extracted cluster from details: {cluster}")
+                    return cluster
+            
+            # Strategy 3: Extract from message
             message = self._safe_str(alert_data.get('message', ''))
-            cluster_patterns = [
-                r'cluster[:\s]+([a-zA-Z0-9\-_]+)',
-                r'datanode-\d+-([a-zA-Z0-9\-_]+)',
-                r'([a-zA-Z0-9\-_]+)-cloud-',
-                r'in\s+([a-zA-Z0-9\-_]+)\s+cluster',
-            ]
-            for pattern in cluster_patterns:
-                match = re.search(pattern, message, re.IGNORECASE)
+            for pattern in _MESSAGE_CLUSTER_PATTERNS:
+                match = pattern.search(message)
                 if match:
                     cluster = match.group(1)
                     if self._looks_like_cluster_name(cluster):
                         logger.debug(f"Extracted cluster from message: {cluster}")
                         return cluster
             
-            # Strategy 3: Check entity field
+            # Strategy 4: Check entity field
             entity = self._safe_str(alert_data.get('entity', '')).strip()
             if entity and self._looks_like_cluster_name(entity):
                 logger.debug(f"Using entity as cluster: {entity}")
@@ -340,15 +496,8 @@ class JSMService:
         if not instance:
             return None
         
-        # Pattern: datanode-21-pro-cloud-shared-aws-us-east-1
-        patterns = [
-            r'^([a-zA-Z0-9\-_]+)-cloud-',  # Extract before '-cloud-'
-            r'^([a-zA-Z0-9\-_]+)-\d+-',    # Extract before number
-            r'^([a-zA-Z]+)',               # Just the first word
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, instance)
+        for pattern in _INSTANCE_CLUSTER_PATTERNS:
+            match = pattern.search(instance)
             if match:
                 cluster = match.group(1)
                 if self._looks_like_cluster_name(cluster):
@@ -362,19 +511,12 @@ class JSMService:
             return False
         
         # Check if it's not just generic text
-        generic_patterns = [
-            r'^(alert|error|warning|info|debug|message|notification)$',
-            r'^\d+$',  # Just numbers
-            r'^[^a-zA-Z]*$',  # No letters
-            r'^(the|and|or|but|in|on|at|to|for|of|with|by)$',  # Common words
-        ]
-        
-        for pattern in generic_patterns:
-            if re.match(pattern, name, re.IGNORECASE):
+        for pattern in _GENERIC_NAME_PATTERNS:
+            if pattern.match(name):
                 return False
         
         # Must contain at least some alphanumeric characters
-        if not re.search(r'[a-zA-Z0-9]', name):
+        if not _ALNUM_RE.search(name):
             return False
         
         return True
@@ -384,21 +526,12 @@ class JSMService:
         if not name or len(name) < 2:
             return False
         
-        # Common cluster name patterns
-        cluster_indicators = [
-            r'(prod|production|staging|stage|dev|development|test|testing)',
-            r'(cluster|k8s|kubernetes)',
-            r'(east|west|north|south|us|eu|asia)',
-            r'(aws|azure|gcp|cloud)',
-        ]
-        
         # Must be alphanumeric with common separators
-        if not re.match(r'^[a-zA-Z0-9\-_]+$', name):
+        if not _CLUSTER_NAME_CHARS_RE.match(name):
             return False
         
         # Should contain cluster-related terms
-        name_lower = name.lower()
-        return any(re.search(pattern, name_lower) for pattern in cluster_indicators)
+        return _CLUSTER_INDICATOR_RE.search(name.lower()) is not None
     
     async def acknowledge_jsm_alert(self, alert_id: str, note: str = None, user: str = None) -> bool:
         """Acknowledge a JSM alert"""
@@ -407,7 +540,7 @@ class JSMService:
             if not cloud_id:
                 return False
             
-            self._rate_limit()
+            await self._rate_limit()
             url = f"{self.base_url}/{cloud_id}/v1/alerts/{alert_id}/acknowledge"
             
             payload = {}
@@ -416,8 +549,9 @@ class JSMService:
             if user:
                 payload["user"] = user
             
-            response = requests.post(
-                url, 
+            response = await asyncio.to_thread(
+                self.session.post,
+                url,
                 headers=self.headers, 
                 json=payload,
                 timeout=getattr(settings, 'JSM_API_TIMEOUT', 30)
@@ -438,7 +572,7 @@ class JSMService:
             if not cloud_id:
                 return False
             
-            self._rate_limit()
+            await self._rate_limit()
             url = f"{self.base_url}/{cloud_id}/v1/alerts/{alert_id}/close"
             
             payload = {}
@@ -447,8 +581,9 @@ class JSMService:
             if user:
                 payload["user"] = user
             
-            response = requests.post(
-                url, 
+            response = await asyncio.to_thread(
+                self.session.post,
+                url,
                 headers=self.headers, 
                 json=payload,
                 timeout=getattr(settings, 'JSM_API_TIMEOUT', 30)
@@ -1,9 +1,14 @@
+import os
 import re
+import json
+import hashlib
 import logging
 import time
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime, timedelta
 from difflib import SequenceMatcher
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from ..core.config import settings
 
 # Optional: Try to import sklearn, fallback to basic similarity if not available
@@ -15,12 +20,124 @@ except ImportError:
     SKLEARN_AVAILABLE = False
     logging.warning("sklearn not available, using basic text similarity")
 
+# Optional: batched C-level string similarity for whole alert batches
+try:
+    import numpy as np
+    from rapidfuzz.fuzz import ratio as fuzz_ratio
+    from rapidfuzz.process import cdist
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Optional: persistent cache for pair scores across sync runs
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Name/cluster sequence similarity. rapidfuzz's ratio is the normalized Indel (LCS)
+# similarity, while difflib's SequenceMatcher counts greedy matching blocks, so
+# rapidfuzz scores are never lower and differ for reordered strings
+# (e.g. '-b-' vs 'ba-': 0.67 vs 0.33). Every pair is scored with the same one, and
+# the scorer name is part of the persistent cache key so results never mix
+_SEQUENCE_SCORER = 'rapidfuzz-indel' if RAPIDFUZZ_AVAILABLE else 'difflib'
+# Bump when scoring changes so persisted pair scores from older versions are ignored
+_SCORE_CACHE_VERSION = 2
+
+def _sequence_ratio(a: str, b: str) -> float:
+    """Sequence similarity of two strings in [0, 1] using the active scorer."""
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz_ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b).ratio()
+
+def _build_score_fn(weights: Dict[str, float]):
+    """
+    Generate the weighted-sum scoring function with the weights inlined as constants.
+    
+    Avoids a dict lookup per component on every (Grafana, JSM) pair scored.
+    """
+    args = ', '.join(weights)
+    body = ' + '.join(f"{weight!r} * {name}" for name, weight in weights.items())
+    namespace = {}
+    exec(f"def _score({args}):\n    return {body}\n", namespace)
+    return namespace['_score']
+
+# JSM tags containing any of these are identifiers, not descriptive text
+_NOISY_TAG_MARKERS = ('ip:', 'id:', 'uuid:')
+
+_WORD_RE = re.compile(r'\b\w+\b')
+_NAME_STRIP_RE = re.compile(r'[^\w\s-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_NAME_PREFIX_RE = re.compile(r'^(alert|rule|notification)[:\s]*')
+_NAME_SUFFIX_RE = re.compile(r'[:\s]*(alert|rule|notification)$')
+
+# Worker pool for scoring large match batches, created on first use and reused by every
+# AlertMatchingService in the process; shut down via shutdown_match_pool() on app shutdown
+_match_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_match_pool() -> ProcessPoolExecutor:
+    """Return the shared scoring pool, creating it on first use."""
+    global _match_pool
+    if _match_pool is None:
+        _match_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _match_pool
+
+def shutdown_match_pool():
+    """Stop the scoring worker processes, if any were started."""
+    global _match_pool
+    if _match_pool is not None:
+        _match_pool.shutdown(wait=False, cancel_futures=True)
+        _match_pool = None
+
+# Scorers built inside a worker process, keyed by weights; each worker builds one per
+# weight set for its lifetime instead of one per chunk
+_worker_scorers: Dict[Tuple[Tuple[str, float], ...], 'AlertMatchingService'] = {}
+
+def _match_chunk(weights: Dict[str, float], grafana_chunk: List[Dict], jsm_alerts: List[Dict],
+                 grafana_hashes: Optional[List[str]], jsm_hashes: Optional[List[str]],
+                 name_ratios: Optional[Any], cluster_ratios: Optional[Any]) -> List[List[Tuple[float, Dict]]]:
+    """
+    Score a chunk of Grafana alerts against every JSM alert in a worker process.
+    
+    Returns one row of (confidence, details) per Grafana alert in the chunk.
+    """
+    scorer_key = tuple(weights.items())
+    service = _worker_scorers.get(scorer_key)
+    if service is None:
+        service = _worker_scorers[scorer_key] = AlertMatchingService(weights=weights)
+    
+    service._jsm_name_cache = {}
+    rows = []
+    try:
+        for i, grafana_alert in enumerate(grafana_chunk):
+            row = []
+            for j, jsm_alert in enumerate(jsm_alerts):
+                cache_key = (grafana_hashes[i], jsm_hashes[j]) if grafana_hashes is not None else None
+                precomputed = None
+                if name_ratios is not None:
+                    precomputed = {
+                        'name_ratio': float(name_ratios[i, j]),
+                        'cluster_ratio': float(cluster_ratios[i, j])
+                    }
+                
+                try:
+                    row.append(service._score_pair(grafana_alert, jsm_alert, cache_key, precomputed))
+                except Exception as e:
+                    logger.error(f"Error matching alerts: {e}")
+                    row.append((0.0, {'error': str(e)}))
+            rows.append(row)
+    finally:
+        service._jsm_name_cache = None
+    
+    return rows
+
 class AlertMatchingService:
     """Enhanced alert matching service with multiple similarity algorithms"""
     
-    def __init__(self, confidence_threshold: float = None):
+    def __init__(self, confidence_threshold: float = None, weights: Optional[Dict[str, float]] = None):
         self.confidence_threshold = confidence_threshold or settings.ALERT_MATCH_CONFIDENCE_THRESHOLD / 100.0
         self.high_confidence_threshold = getattr(settings, 'ALERT_MATCH_HIGH_CONFIDENCE_THRESHOLD', 85.0) / 100.0
         self.manual_review_threshold = getattr(settings, 'ALERT_MATCH_MANUAL_REVIEW_THRESHOLD', 60.0) / 100.0
@@ -43,13 +160,30 @@ class AlertMatchingService:
             self.vectorizer = None
         
         # Matching weights for different components
-        self.weights = {
+        self.weights = dict(weights) if weights else {
             'name_similarity': 0.40,      # Alert name matching is most important
             'cluster_similarity': 0.25,   # Cluster/instance matching
             'severity_similarity': 0.15,  # Severity level matching
             'temporal_similarity': 0.10,  # Time proximity
             'content_similarity': 0.10    # Content/description similarity
         }
+        # Specialized for the weights above; rebuild if self.weights changes
+        self._score_fn = _build_score_fn(self.weights)
+        
+        # Most alerts persist across periodic syncs, so pair scores are cached on disk
+        # keyed by the content hashes of both alerts
+        self._score_cache = None
+        self._score_cache_ttl = getattr(settings, 'MATCHING_CACHE_TTL_MINUTES', 30) * 60
+        if DISKCACHE_AVAILABLE and getattr(settings, 'ENABLE_MATCHING_CACHE', False):
+            try:
+                self._score_cache = diskcache.Cache(settings.MATCHING_CACHE_DIR)
+            except Exception as e:
+                logger.warning(f"Failed to open matching cache, scoring without it: {e}")
+        
+        # Field extraction for JSM alerts goes through one JSMService instance
+        self._jsm_service = None
+        # Extracted JSM alert names by alert id; only set while a batch is being matched
+        self._jsm_name_cache: Optional[Dict[str, Optional[str]]] = None
         
         logger.info(f"AlertMatchingService initialized with threshold: {self.confidence_threshold:.2%}")
     
@@ -59,12 +193,56 @@ class AlertMatchingService:
         
         Returns list of match results with confidence scores.
         """
+        # Each JSM alert's name is extracted once per batch rather than once per pair
+        self._jsm_name_cache = {}
+        try:
+            return self._match_batch(grafana_alerts, jsm_alerts)
+        finally:
+            self._jsm_name_cache = None
+    
+    def _match_batch(self, grafana_alerts: List[Dict], jsm_alerts: List[Dict]) -> List[Dict]:
+        """Greedily assign each Grafana alert its best-scoring unused JSM alert."""
         start_time = time.time()
         matches = []
         used_jsm_alerts = set()
         
         logger.info(f"Starting alert matching: {len(grafana_alerts)} Grafana alerts, {len(jsm_alerts)} JSM alerts")
         
+        grafana_hashes = jsm_hashes = None
+        if self._score_cache is not None:
+            grafana_hashes = [self._content_hash(alert) for alert in grafana_alerts]
+            jsm_hashes = [self._content_hash(alert) for alert in jsm_alerts]
+        
+        # Compute all name/cluster sequence ratios up front in two batched calls
+        name_ratios, cluster_ratios = self._sequence_ratio_matrices(grafana_alerts, jsm_alerts)
+        
+        # Inverted index: normalized JSM alert name -> indices of JSM alerts with that name.
+        # Each Grafana alert is scored against same-name candidates first, falling back to
+        # every JSM alert (when fuzzy matching is enabled) if none of them reaches the threshold
+        jsm_by_name = defaultdict(list)
+        for j, jsm_alert in enumerate(jsm_alerts):
+            name_key = self._normalize_alert_name(self._extract_jsm_alert_name(jsm_alert))
+            if name_key:
+                jsm_by_name[name_key].append(j)
+        all_jsm_indices = range(len(jsm_alerts))
+        fuzzy_fallback = getattr(settings, 'ENABLE_FUZZY_MATCHING', True)
+        grafana_keys = [self._normalize_alert_name(self._extract_grafana_alert_name(a)) for a in grafana_alerts]
+        
+        # Grafana alerts with no same-name JSM alert always need a full scan. When there
+        # are many, score those rows across worker processes first; every other pair is
+        # scored on demand in the greedy assignment below
+        score_rows = {}
+        full_scan_rows = [i for i, key in enumerate(grafana_keys) if key not in jsm_by_name] if fuzzy_fallback else []
+        if jsm_alerts and len(full_scan_rows) > getattr(settings, 'MATCH_PARALLEL_THRESHOLD', 200):
+            rows = self._score_in_parallel(
+                [grafana_alerts[i] for i in full_scan_rows], jsm_alerts,
+                [grafana_hashes[i] for i in full_scan_rows] if grafana_hashes is not None else None, jsm_hashes,
+                name_ratios[full_scan_rows] if name_ratios is not None else None,
+                cluster_ratios[full_scan_rows] if cluster_ratios is not None else None
+            )
+            if rows is not None:
+                score_rows = dict(zip(full_scan_rows, rows))
+        
         for i, grafana_alert in enumerate(grafana_alerts):
             match_info = {
                 'grafana_alert': grafana_alert,
@@ -78,23 +256,45 @@ class AlertMatchingService:
             best_confidence = 0.0
             best_details = {}
             
-            # Try to match with each available JSM alert
-            for jsm_alert in jsm_alerts:
-                jsm_id = self._safe_str(jsm_alert.get('id', ''))
-                if jsm_id in used_jsm_alerts:
-                    continue
-                
-                try:
-                    confidence, details = self.calculate_match_confidence(grafana_alert, jsm_alert)
+            # Same-name candidates first. If none of them reaches the threshold (or all are
+            # already used), fall back to every other JSM alert when fuzzy matching is enabled
+            same_name = jsm_by_name.get(grafana_keys[i], ())
+            candidate_passes = [same_name]
+            if fuzzy_fallback:
+                same_name_set = set(same_name)
+                candidate_passes.append(j for j in all_jsm_indices if j not in same_name_set)
+            
+            # Try to match with each candidate JSM alert
+            for candidates in candidate_passes:
+                if best_match is not None:
+                    break
+                for j in candidates:
+                    jsm_alert = jsm_alerts[j]
+                    jsm_id = self._safe_str(jsm_alert.get('id', ''))
+                    if jsm_id in used_jsm_alerts:
+                        continue
                     
-                    if confidence > best_confidence and confidence >= self.confidence_threshold:
-                        best_confidence = confidence
-                        best_match = jsm_alert
-                        best_details = details
+                    try:
+                        if i in score_rows:
+                            confidence, details = score_rows[i][j]
+                        else:
+                            cache_key = (grafana_hashes[i], jsm_hashes[j]) if grafana_hashes is not None else None
+                            precomputed = None
+                            if name_ratios is not None:
+                                precomputed = {
+                                    'name_ratio': float(name_ratios[i, j]),
+                                    'cluster_ratio': float(cluster_ratios[i, j])
+                                }
+                            confidence, details = self._score_pair(grafana_alert, jsm_alert, cache_key, precomputed)
                         
-                except Exception as e:
-                    logger.error(f"Error matching alerts: {e}")
-                    continue
+                        if confidence > best_confidence and confidence >= self.confidence_threshold:
+                            best_confidence = confidence
+                            best_match = jsm_alert
+                            best_details = details
+                    
+                    except Exception as e:
+                        logger.error(f"Error matching alerts: {e}")
+                        continue
             
             # If we found a good match, use it
             if best_match:
@@ -124,14 +324,18 @@ class AlertMatchingService:
         
         return matches
     
-    def calculate_match_confidence(self, grafana_alert: Dict, jsm_alert: Dict) -> Tuple[float, Dict]:
+    def calculate_match_confidence(self, grafana_alert: Dict, jsm_alert: Dict, precomputed: Optional[Dict] = None) -> Tuple[float, Dict]:
         """
         Calculate comprehensive match confidence between Grafana and JSM alerts.
         
+        `precomputed` may carry batch-computed 'name_ratio' and 'cluster_ratio'
+        sequence ratios for this pair, skipping the per-pair sequence scoring.
+        
         Returns:
             Tuple of (confidence_score, details_dict)
         """
         try:
+            precomputed = precomputed or {}
             scores = {}
             details = {}
             
@@ -140,7 +344,9 @@ class AlertMatchingService:
             jsm_name = self._extract_jsm_alert_name(jsm_alert)
             
             if grafana_name and jsm_name:
-                name_score, name_details = self._calculate_name_similarity(grafana_name, jsm_name)
+                name_score, name_details = self._calculate_name_similarity(
+                    grafana_name, jsm_name, precomputed.get('name_ratio')
+                )
                 scores['name_similarity'] = name_score
                 details['name_match'] = name_details
             else:
@@ -151,7 +357,9 @@ class AlertMatchingService:
             grafana_cluster = self._extract_grafana_cluster(grafana_alert)
             jsm_cluster = self._extract_jsm_cluster(jsm_alert)
             
-            cluster_score, cluster_details = self._calculate_cluster_similarity(grafana_cluster, jsm_cluster)
+            cluster_score, cluster_details = self._calculate_cluster_similarity(
+                grafana_cluster, jsm_cluster, precomputed.get('cluster_ratio')
+            )
             scores['cluster_similarity'] = cluster_score
             details['cluster_match'] = cluster_details
             
@@ -174,7 +382,7 @@ class AlertMatchingService:
             details['content_match'] = content_details
             
             # Calculate weighted confidence score
-            confidence = sum(scores[key] * self.weights[key] for key in scores.keys())
+            confidence = self._score_fn(**scores)
             
             # Add component scores to details
             details['component_scores'] = scores
@@ -190,7 +398,99 @@ class AlertMatchingService:
             logger.error(f"Error calculating match confidence: {e}")
             return 0.0, {'error': str(e)}
     
-    def _calculate_name_similarity(self, grafana_name: str, jsm_name: str) -> Tuple[float, Dict]:
+    def _score_in_parallel(self, grafana_alerts: List[Dict], jsm_alerts: List[Dict],
+                           grafana_hashes: Optional[List[str]], jsm_hashes: Optional[List[str]],
+                           name_ratios: Optional[Any], cluster_ratios: Optional[Any]) -> Optional[List[List[Tuple[float, Dict]]]]:
+        """
+        Score all pairs by sharding Grafana alerts across the shared process pool.
+        
+        Workers receive only the weights and alert data, never this service.
+        Returns None if the pool cannot be used, so the caller scores serially.
+        """
+        workers = os.cpu_count() or 1
+        chunk_size = -(-len(grafana_alerts) // workers)  # ceil division
+        bounds = [(start, start + chunk_size) for start in range(0, len(grafana_alerts), chunk_size)]
+        
+        logger.info(f"Scoring {len(grafana_alerts)}x{len(jsm_alerts)} alert pairs across {len(bounds)} worker process(es)")
+        
+        try:
+            chunks = _get_match_pool().map(
+                _match_chunk,
+                [self.weights] * len(bounds),
+                [grafana_alerts[start:end] for start, end in bounds],
+                [jsm_alerts] * len(bounds),
+                [grafana_hashes[start:end] if grafana_hashes is not None else None for start, end in bounds],
+                [jsm_hashes] * len(bounds),
+                [name_ratios[start:end] if name_ratios is not None else None for start, end in bounds],
+                [cluster_ratios[start:end] if cluster_ratios is not None else None for start, end in bounds]
+            )
+            return [row for chunk in chunks for row in chunk]
+        except Exception as e:
+            logger.warning(f"Parallel scoring failed, falling back to serial matching: {e}")
+            # A broken pool can't be reused; the next large batch starts a fresh one
+            shutdown_match_pool()
+            return None
+    
+    def _score_pair(self, grafana_alert: Dict, jsm_alert: Dict, cache_key: Optional[Tuple[str, str]] = None,
+                    precomputed: Optional[Dict] = None) -> Tuple[float, Dict]:
+        """Score one pair, going through the persistent cache when it is enabled."""
+        if cache_key is not None and self._score_cache is not None:
+            return self._cached_match_confidence(grafana_alert, jsm_alert, cache_key, precomputed)
+        return self.calculate_match_confidence(grafana_alert, jsm_alert, precomputed)
+    
+    def _cached_match_confidence(self, grafana_alert: Dict, jsm_alert: Dict, cache_key: Tuple[str, str],
+                                 precomputed: Optional[Dict] = None) -> Tuple[float, Dict]:
+        """Return the pair score from the persistent cache, computing it on a miss."""
+        cache_key = (_SEQUENCE_SCORER, _SCORE_CACHE_VERSION) + tuple(cache_key)
+        try:
+            cached = self._score_cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Matching cache read failed: {e}")
+            cached = None
+        
+        if cached is not None:
+            return cached
+        
+        confidence, details = self.calculate_match_confidence(grafana_alert, jsm_alert, precomputed)
+        
+        # Don't persist failed scorings
+        if 'error' not in details:
+            try:
+                self._score_cache.set(cache_key, (confidence, details), expire=self._score_cache_ttl)
+            except Exception as e:
+                logger.warning(f"Matching cache write failed: {e}")
+        
+        return confidence, details
+    
+    def _sequence_ratio_matrices(self, grafana_alerts: List[Dict], jsm_alerts: List[Dict]) -> Tuple[Optional[Any], Optional[Any]]:
+        """
+        Compute the N x M name and cluster sequence-ratio matrices with rapidfuzz.
+        
+        Returns (None, None) when rapidfuzz is unavailable, in which case pairs
+        are scored one at a time with _sequence_ratio.
+        """
+        if not RAPIDFUZZ_AVAILABLE or not grafana_alerts or not jsm_alerts:
+            return None, None
+        
+        try:
+            grafana_names = [self._normalize_alert_name(self._extract_grafana_alert_name(a)) for a in grafana_alerts]
+            jsm_names = [self._normalize_alert_name(self._extract_jsm_alert_name(a)) for a in jsm_alerts]
+            grafana_clusters = [self._safe_str(self._extract_grafana_cluster(a)).lower() for a in grafana_alerts]
+            jsm_clusters = [self._safe_str(self._extract_jsm_cluster(a)).lower() for a in jsm_alerts]
+            
+            name_ratios = cdist(grafana_names, jsm_names, scorer=fuzz_ratio, workers=-1, dtype=np.float32) / 100.0
+            cluster_ratios = cdist(grafana_clusters, jsm_clusters, scorer=fuzz_ratio, workers=-1, dtype=np.float32) / 100.0
+            return name_ratios, cluster_ratios
+        except Exception as e:
+            logger.warning(f"Batched similarity failed, using per-pair matching: {e}")
+            return None, None
+    
+    def _content_hash(self, alert: Dict) -> str:
+        """Stable digest of an alert's content, used as a matching cache key."""
+        canonical = json.dumps(alert, sort_keys=True, default=str)
+        return hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+    
+    def _calculate_name_similarity(self, grafana_name: str, jsm_name: str, sequence_ratio: Optional[float] = None) -> Tuple[float, Dict]:
         """Calculate similarity between alert names using multiple methods."""
         if not grafana_name or not jsm_name:
             return 0.0, {'method': 'missing_names'}
@@ -208,7 +508,8 @@ class AlertMatchingService:
             return 0.90, {'method': 'substring_match', 'normalized_names': [grafana_norm, jsm_norm]}
         
         # Sequence matching (handles typos and variations)
-        sequence_ratio = SequenceMatcher(None, grafana_norm, jsm_norm).ratio()
+        if sequence_ratio is None:
+            sequence_ratio = _sequence_ratio(grafana_norm, jsm_norm)
         
         # Word-based Jaccard similarity
         grafana_words = set(grafana_norm.split())
@@ -233,7 +534,7 @@ class AlertMatchingService:
             'word_overlap': len(grafana_words.intersection(jsm_words)) if grafana_words and jsm_words else 0
         }
     
-    def _calculate_cluster_similarity(self, grafana_cluster: str, jsm_cluster: str) -> Tuple[float, Dict]:
+    def _calculate_cluster_similarity(self, grafana_cluster: str, jsm_cluster: str, sequence_ratio: Optional[float] = None) -> Tuple[float, Dict]:
         """Calculate cluster/instance similarity."""
         if not jsm_cluster:
             return 0.5, {'method': 'no_jsm_cluster', 'reason': 'neutral_score'}
@@ -253,7 +554,10 @@ class AlertMatchingService:
             return 0.85, {'method': 'substring_match', 'clusters': [grafana_cluster, jsm_cluster]}
         
         # Sequence similarity
-        similarity = SequenceMatcher(None, grafana_lower, jsm_lower).ratio()
+        if sequence_ratio is not None:
+            similarity = sequence_ratio
+        else:
+            similarity = _sequence_ratio(grafana_lower, jsm_lower)
         
         return similarity, {
             'method': 'sequence_similarity',
@@ -388,8 +692,8 @@ class AlertMatchingService:
                     logger.warning(f"TF-IDF similarity failed, using basic method: {e}")
             
             # Fallback to basic word overlap similarity
-            grafana_words = set(re.findall(r'\b\w+\b', grafana_text.lower()))
-            jsm_words = set(re.findall(r'\b\w+\b', jsm_text.lower()))
+            grafana_words = set(_WORD_RE.findall(grafana_text.lower()))
+            jsm_words = set(_WORD_RE.findall(jsm_text.lower()))
             
             if grafana_words and jsm_words:
                 intersection = grafana_words.intersection(jsm_words)
@@ -443,23 +747,25 @@ class AlertMatchingService:
         """Extract severity from Grafana alert."""
         return alert.get('labels', {}).get('severity', 'info')
     
+    @property
+    def jsm_service(self):
+        """JSMService used for JSM field extraction, created on first use."""
+        if self._jsm_service is None:
+            from .jsm_service import JSMService
+            self._jsm_service = JSMService()
+        return self._jsm_service
+    
     def _extract_jsm_alert_name(self, alert: Dict) -> str:
         """Extract alert name from JSM alert."""
-        from .jsm_service import JSMService
-        jsm_service = JSMService()
-        return jsm_service.extract_alert_name_from_jsm(alert) or ''
+        return self.jsm_service.extract_alert_name_from_jsm(alert, self._jsm_name_cache) or ''
     
     def _extract_jsm_cluster(self, alert: Dict) -> str:
         """Extract cluster from JSM alert."""
-        from .jsm_service import JSMService
-        jsm_service = JSMService()
-        return jsm_service.extract_cluster_from_jsm(alert) or ''
+        return self.jsm_service.extract_cluster_from_jsm(alert) or ''
     
     def _extract_jsm_severity(self, alert: Dict) -> str:
         """Extract severity from JSM alert."""
-        from .jsm_service import JSMService
-        jsm_service = JSMService()
-        return jsm_service.extract_severity_from_jsm(alert) or 'info'
+        return self.jsm_service.extract_severity_from_jsm(alert) or 'info'
     
     def _normalize_alert_name(self, name: str) -> str:
         """Normalize alert name for comparison."""
@@ -467,62 +773,38 @@ class AlertMatchingService:
             return ''
         
         # Remove special characters and convert to lowercase
-        normalized = re.sub(r'[^\w\s-]', '', name.lower())
+        normalized = _NAME_STRIP_RE.sub('', name.lower())
         # Remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
         # Remove common prefixes/suffixes
-        normalized = re.sub(r'^(alert|rule|notification)[:\s]*', '', normalized)
-        normalized = re.sub(r'[:\s]*(alert|rule|notification)$', '', normalized)
+        normalized = _NAME_PREFIX_RE.sub('', normalized)
+        normalized = _NAME_SUFFIX_RE.sub('', normalized)
         
         return normalized
     
     def _extract_grafana_text(self, alert: Dict) -> str:
         """Extract searchable text from Grafana alert."""
-        text_parts = []
-        
-        # Add alert name
-        labels = alert.get('labels', {})
-        if 'alertname' in labels:
-            text_parts.append(labels['alertname'])
-        
-        # Add annotations
         annotations = alert.get('annotations', {})
-        for key, value in annotations.items():
-            if isinstance(value, str) and value.strip():
-                text_parts.append(value)
-        
-        # Add summary if available
-        if 'summary' in alert:
-            text_parts.append(str(alert['summary']))
-        
-        return ' '.join(text_parts)
+        return ' '.join(filter(None, (
+            alert.get('labels', {}).get('alertname'),
+            *(value for value in annotations.values() if isinstance(value, str) and value.strip()),
+            str(alert['summary']) if 'summary' in alert else None
+        )))
     
     def _extract_jsm_text(self, alert: Dict) -> str:
         """Extract searchable text from JSM alert."""
         alert_data = alert.get('data', alert)
-        text_parts = []
-        
-        # Add message
-        message = alert_data.get('message', '')
-        if message:
-            text_parts.append(message)
-        
-        # Add description
-        description = alert_data.get('description', '')
-        if description:
-            text_parts.append(description)
-        
-        # Add relevant tags (filter out noisy ones)
-        tags = alert_data.get('tags', [])
-        relevant_tags = []
-        for tag in tags:
-            if isinstance(tag, str) and not any(exclude in tag.lower() for exclude in ['ip:', 'id:', 'uuid:']):
-                relevant_tags.append(tag)
-        
-        if relevant_tags:
-            text_parts.extend(relevant_tags)
         
-        return ' '.join(str(part) for part in text_parts if part)
+        # Keep relevant tags only (filter out noisy ones)
+        tags = (
+            tag for tag in alert_data.get('tags', [])
+            if isinstance(tag, str) and not any(exclude in tag.lower() for exclude in _NOISY_TAG_MARKERS)
+        )
+        return ' '.join(map(str, filter(None, (
+            alert_data.get('message', ''),
+            alert_data.get('description', ''),
+            *tags
+        ))))
     
     def _parse_grafana_timestamp(self, alert: Dict) -> Optional[datetime]:
         """Parse timestamp from Grafana alert."""
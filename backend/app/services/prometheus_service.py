@@ -1,31 +1,347 @@
-import requests
+import os
+import re
+import sys
+import hashlib
+import aiohttp
+import orjson
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from ..core.config import settings
 import asyncio
+import itertools
 import time
 
 logger = logging.getLogger(__name__)
 
+# Alerts APIs probed on each endpoint, in order of preference
+_API_PATHS = ("/api/v1/alerts", "/api/v2/alerts")
+
+_RFC3339 = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:?\d{2})?$'
+)
+
+# Health re-check schedule: healthy endpoints are re-probed every 10 minutes,
+# unhealthy ones after 30s, doubling on each further failure up to 5 minutes
+_HEALTHY_RECHECK_SECONDS = 600.0
+_UNHEALTHY_BACKOFF_MIN_SECONDS = 30.0
+_UNHEALTHY_BACKOFF_MAX_SECONDS = 300.0
+
+# Alert states worth syncing (both APIs report states in lowercase)
+_FIRING_STATES = frozenset({'firing'})
+_ACTIVE_STATES = frozenset({'active'})
+
+# Label/annotation names checked for each field, in priority order
+_CLUSTER_LABELS = ('cluster', 'cluster_name', 'kubernetes_cluster', 'k8s_cluster', 'region')
+_SEVERITY_LABELS = ('severity', 'priority', 'level')
+_SUMMARY_FIELDS = ('summary', 'message', 'description')
+
+# Common patterns for cluster extraction from instance strings, in priority order
+_CLUSTER_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'[\w\-]*?(prod|production)[\w\-]*',
+        r'[\w\-]*?(staging|stage)[\w\-]*',
+        r'[\w\-]*?(dev|development)[\w\-]*',
+        r'[\w\-]*?(test|testing)[\w\-]*',
+        r'[\w\-]*?cluster[\w\-]*',
+        r'[\w\-]*?k8s[\w\-]*',
+        r'us-east[\w\-]*',
+        r'us-west[\w\-]*',
+        r'eu-[\w\-]*',
+    )
+]
+
+# Transient gateway errors and refused connections are retried with exponential
+# backoff (0.3s, 0.6s) before an endpoint is reported as failing
+_RETRY_STATUSES = frozenset({502, 503, 504})
+_RETRY_ATTEMPTS = 3
+_RETRY_BACKOFF_SECONDS = 0.3
+
+# Responses with more alerts than this are parsed across worker processes
+_PARALLEL_PARSE_THRESHOLD = 500
+
+# Label values shorter than this are interned; canonical label sets are shared as
+# immutable (key, value) tuples through a pool that is reset once it reaches
+# _LABELS_POOL_MAX entries
+_INTERN_MAX_LEN = 64
+_LABELS_POOL_MAX = 4096
+LabelItems = Tuple[Tuple[str, Any], ...]
+_labels_pool: Dict[frozenset, LabelItems] = {}
+
+# Probe results are reused for this long, so back-to-back health checks and
+# connectivity tests don't hit every endpoint twice
+_PROBE_TTL = 1.0
+
+@lru_cache(maxsize=4096)
+def _parse_rfc3339(date_str: str) -> Optional[datetime]:
+    """Parse an RFC3339 timestamp, returning None if it is malformed.
+
+    Alerts from the same rule group usually share identical timestamps, so
+    results are memoized across a fetch.
+    """
+    try:
+        match = _RFC3339.match(date_str)
+        if match:
+            year, month, day, hour, minute, second, fraction, tz = match.groups()
+            # Truncate nanoseconds to microseconds
+            microsecond = int((fraction or '')[:6].ljust(6, '0'))
+            
+            tzinfo = None
+            if tz == 'Z':
+                tzinfo = timezone.utc
+            elif tz:
+                offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[-2:]))
+                tzinfo = timezone(-offset if tz[0] == '-' else offset)
+            
+            return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                            microsecond, tzinfo=tzinfo)
+        
+        # Anything else ISO-like goes through the stdlib parser
+        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except ValueError as e:
+        logger.warning(f"Failed to parse datetime '{date_str}': {e}")
+        return None
+
+def _fingerprint(*parts: str) -> str:
+    """Stable short digest of the given parts (unlike hash(), not salted per process)."""
+    return hashlib.blake2b('\x1f'.join(parts).encode(), digest_size=8).hexdigest()
+
+@dataclass(slots=True)
+class ParsedAlert:
+    """A normalized Prometheus/Alertmanager alert."""
+    alert_id: str
+    alert_name: str
+    cluster: Optional[str]
+    pod: Optional[str]
+    instance: str
+    severity: str
+    summary: str
+    description: str
+    started_at: datetime
+    generator_url: Optional[str]
+    labels: LabelItems  # Shared between alerts with the same label set, so kept immutable
+    annotations: LabelItems
+    source: str = 'prometheus'
+    source_instance: str = ''
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict view for the dict-based matching and persistence layers, with fresh label/annotation dicts."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['labels'] = dict(self.labels)
+        data['annotations'] = dict(self.annotations)
+        return data
+
+def _intern_labels(labels: Dict[str, Any]) -> LabelItems:
+    """Intern label keys and short values, returning a shared (key, value) tuple for repeated label sets."""
+    interned = tuple(
+        (sys.intern(key), sys.intern(value) if isinstance(value, str) and len(value) < _INTERN_MAX_LEN else value)
+        for key, value in labels.items()
+    )
+    
+    try:
+        pool_key = frozenset(interned)
+    except TypeError:
+        # Unhashable (nested) values can't be pooled
+        return interned
+    
+    shared = _labels_pool.get(pool_key)
+    if shared is None:
+        if len(_labels_pool) >= _LABELS_POOL_MAX:
+            _labels_pool.clear()
+        _labels_pool[pool_key] = shared = interned
+    return shared
+
+def _parse_prometheus_alert(alert: Dict[str, Any], source_instance: str, now: datetime) -> Optional[ParsedAlert]:
+    """Parse a single Prometheus alert."""
+    try:
+        label_items = _intern_labels(alert.get('labels') or {})
+        annotation_items = _intern_labels(alert.get('annotations') or {})
+        labels, annotations = dict(label_items), dict(annotation_items)
+        
+        alert_name = labels.get('alertname', 'Unknown')
+        instance = labels.get('instance', '')
+        
+        # Generate unique alert ID using fingerprint if available, otherwise hash
+        fingerprint = _fingerprint(alert_name, instance, labels.get('job', ''), source_instance)
+        alert_id = f"prometheus-{alert_name}-{fingerprint}"
+        
+        # Extract cluster, severity and summary
+        cluster, severity, summary = _extract_fields(labels, annotations, instance, alert_name)
+        description = annotations.get('description', annotations.get('summary', ''))
+        
+        parsed_alert = ParsedAlert(
+            alert_id=alert_id,
+            alert_name=alert_name,
+            cluster=cluster,
+            pod=labels.get('pod', labels.get('kubernetes_pod_name')),
+            instance=instance,
+            severity=severity,
+            summary=summary,
+            description=description,
+            started_at=_parse_datetime(alert.get('activeAt'), now),
+            generator_url=None,  # Not available in Prometheus API
+            labels=label_items,
+            annotations=annotation_items,
+            source_instance=source_instance
+        )
+        
+        logger.debug(f"✅ Parsed Prometheus alert: {alert_name} from {cluster or 'unknown cluster'}")
+        return parsed_alert
+        
+    except Exception as e:
+        logger.error(f"Error parsing Prometheus alert: {e}")
+        logger.debug(f"Alert data: {alert}")
+        return None
+
+def _parse_alertmanager_alert(alert: Dict[str, Any], source_instance: str, now: datetime) -> Optional[ParsedAlert]:
+    """Parse a single Alertmanager alert."""
+    try:
+        label_items = _intern_labels(alert.get('labels') or {})
+        annotation_items = _intern_labels(alert.get('annotations') or {})
+        labels, annotations = dict(label_items), dict(annotation_items)
+        
+        alert_name = labels.get('alertname', 'Unknown')
+        fingerprint = alert.get('fingerprint')
+        if not fingerprint:
+            canonical_labels = '\x1f'.join(f"{key}={value}" for key, value in sorted(labels.items()))
+            fingerprint = _fingerprint(canonical_labels, source_instance)
+        
+        alert_id = f"alertmanager-{alert_name}-{fingerprint}"
+        
+        # Extract cluster, severity and summary
+        instance = labels.get('instance', '')
+        cluster, severity, summary = _extract_fields(labels, annotations, instance, alert_name)
+        description = annotations.get('description', '')
+        
+        parsed_alert = ParsedAlert(
+            alert_id=alert_id,
+            alert_name=alert_name,
+            cluster=cluster,
+            pod=labels.get('pod', labels.get('kubernetes_pod_name')),
+            instance=instance,
+            severity=severity,
+            summary=summary,
+            description=description,
+            started_at=_parse_datetime(alert.get('startsAt'), now),
+            generator_url=alert.get('generatorURL'),
+            labels=label_items,
+            annotations=annotation_items,
+            source_instance=source_instance
+        )
+        
+        logger.debug(f"✅ Parsed Alertmanager alert: {alert_name} from {cluster or 'unknown cluster'}")
+        return parsed_alert
+        
+    except Exception as e:
+        logger.error(f"Error parsing Alertmanager alert: {e}")
+        logger.debug(f"Alert data: {alert}")
+        return None
+
+def _extract_fields(labels: Dict, annotations: Dict, instance: str,
+                    alert_name: str) -> Tuple[Optional[str], str, str]:
+    """Extract (cluster, severity, summary) from an alert's labels and annotations."""
+    # Cluster: known cluster labels, then the instance string, then the job
+    cluster = next((labels[label] for label in _CLUSTER_LABELS if labels.get(label)), None)
+    if not cluster and instance:
+        cluster = _extract_cluster_from_instance(instance)
+    if not cluster and 'job' in labels:
+        cluster = labels['job']
+    
+    # Severity: labels first, then annotations
+    severity = next((labels[label] for label in _SEVERITY_LABELS if labels.get(label)), None) \
+        or next((annotations[label] for label in _SEVERITY_LABELS if annotations.get(label)), None)
+    severity = severity.lower() if severity else 'info'  # Default severity
+    
+    # Summary: annotations first, otherwise generate one from the alert name and labels
+    summary = next((annotations[field] for field in _SUMMARY_FIELDS if annotations.get(field)), None)
+    if not summary:
+        if 'instance' in labels:
+            summary = f"Alert {alert_name} on {labels['instance']}"
+        elif 'job' in labels:
+            summary = f"Alert {alert_name} in job {labels['job']}"
+        else:
+            summary = f"Prometheus alert: {alert_name}"
+    
+    return cluster, severity, summary
+
+def _extract_cluster_from_instance(instance: str) -> str:
+    """Try to extract cluster information from instance string."""
+    if not instance:
+        return None
+    
+    # Patterns are tried in priority order, so an earlier pattern wins even
+    # if a later one matches further left in the string
+    for pattern in _CLUSTER_PATTERNS:
+        match = pattern.search(instance)
+        if match:
+            return match.group(0)
+    
+    return None
+
+def _parse_datetime(date_str: str, now: datetime) -> datetime:
+    """Parse datetime string from Prometheus/Alertmanager, falling back to the fetch time."""
+    if not date_str:
+        return now
+    return _parse_rfc3339(date_str) or now
+
+def _parse_chunk(parser: Callable[[Dict[str, Any], str, datetime], Optional[ParsedAlert]],
+                 alerts: List[Dict[str, Any]], source_instance: str, now: datetime) -> List[ParsedAlert]:
+    """Parse a batch of alerts, dropping any that fail to parse (also runs in worker processes)."""
+    return [parsed for parsed in (parser(alert, source_instance, now) for alert in alerts) if parsed]
+
 class PrometheusService:
     def __init__(self):
         # Parse API URLs from config
         self.api_urls = []
         if hasattr(settings, 'PROMETHEUS_API_URLS') and settings.PROMETHEUS_API_URLS:
-            self.api_urls = [url.strip() for url in settings.PROMETHEUS_API_URLS.split(',') if url.strip()]
+            # Normalized once so request URLs can be built by plain concatenation
+            self.api_urls = [url.strip().rstrip('/') for url in settings.PROMETHEUS_API_URLS.split(',') if url.strip()]
         
         self.headers = {
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            # Alert payloads compress well; aiohttp decompresses transparently
+            "Accept-Encoding": "gzip, deflate"
         }
         
         # Endpoint health tracking
-        self.endpoint_health = {}  # Track which endpoints are working
+        self.endpoint_health = {}  # Track which endpoints are working, and when to re-check each
         self.last_health_check = None
-        self.health_check_interval = timedelta(minutes=5)  # Check health every 5 minutes
+        self._probe_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+        
+        # Shared HTTP session (created lazily; bound to the event loop that created it)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Worker pool for parsing very large responses (created on first use)
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
         
         logger.info(f"Initialized PrometheusService with {len(self.api_urls)} endpoint(s): {self.api_urls}")
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared ClientSession, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=8, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(headers=self.headers, connector=connector)
+            self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session and its connection pool, and stop the parse workers."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+        
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+
     async def get_active_alerts(self) -> List[Dict[str, Any]]:
         """Fetch all active alerts from all configured and healthy Prometheus instances."""
         all_alerts = []
@@ -39,8 +355,11 @@ class PrometheusService:
             logger.warning("No Prometheus API URLs configured. Check PROMETHEUS_API_URLS setting.")
             return all_alerts
 
+        # One timestamp for the whole fetch (health bookkeeping and missing alert times)
+        now = datetime.now(timezone.utc)
+        
         # Check endpoint health periodically
-        await self._check_endpoint_health()
+        await self._check_endpoint_health(now)
         
         # Get list of healthy endpoints
         healthy_endpoints = self._get_healthy_endpoints()
@@ -51,181 +370,223 @@ class PrometheusService:
 
         logger.info(f"Using {len(healthy_endpoints)} healthy endpoint(s) out of {len(self.api_urls)} configured")
         
-        # Fetch from all healthy endpoints
-        for endpoint_info in healthy_endpoints:
-            try:
-                alerts = await self._fetch_from_healthy_endpoint(endpoint_info)
-                
-                if alerts:
-                    logger.info(f"Retrieved {len(alerts)} active alerts from {endpoint_info['base_url']}")
-                    all_alerts.extend(alerts)
-                else:
-                    logger.debug(f"No active alerts from {endpoint_info['base_url']}")
-                
-            except Exception as e:
-                logger.error(f"Error fetching from healthy endpoint {endpoint_info['base_url']}: {e}")
+        # Fetch from all healthy endpoints concurrently
+        results = await asyncio.gather(
+            *(self._fetch_from_healthy_endpoint(endpoint_info, now) for endpoint_info in healthy_endpoints),
+            return_exceptions=True
+        )
+        
+        for endpoint_info, result in zip(healthy_endpoints, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching from healthy endpoint {endpoint_info['base_url']}: {result}")
                 # Mark this endpoint as potentially unhealthy
-                self._mark_endpoint_unhealthy(endpoint_info['base_url'], str(e))
+                self._mark_endpoint_unhealthy(endpoint_info['base_url'], str(result), now)
                 continue
+            
+            if result:
+                logger.info(f"Retrieved {len(result)} active alerts from {endpoint_info['base_url']}")
+                all_alerts.extend(alert.to_dict() for alert in result)
+            else:
+                logger.debug(f"No active alerts from {endpoint_info['base_url']}")
         
         logger.info(f"Total Prometheus alerts collected: {len(all_alerts)} from {len(healthy_endpoints)} endpoint(s)")
         return all_alerts
 
-    async def _check_endpoint_health(self):
-        """Check and update the health status of all configured endpoints."""
-        current_time = datetime.utcnow()
-        
-        # Skip health check if we checked recently
-        if (self.last_health_check and 
-            current_time - self.last_health_check < self.health_check_interval):
+    async def _check_endpoint_health(self, now: datetime):
+        """Check the health of endpoints whose re-check time has come."""
+        due_urls = [
+            base_url for base_url in self.api_urls
+            if base_url not in self.endpoint_health or self.endpoint_health[base_url]['next_check'] <= now
+        ]
+        if not due_urls:
             return
         
-        logger.info("Checking health of Prometheus endpoints...")
-        self.last_health_check = current_time
+        logger.info(f"Checking health of {len(due_urls)} Prometheus endpoint(s)...")
+        self.last_health_check = now
         
-        # Check each endpoint
-        for base_url in self.api_urls:
-            await self._check_single_endpoint_health(base_url)
+        # Check due endpoints concurrently
+        await asyncio.gather(*(self._check_single_endpoint_health(base_url, now) for base_url in due_urls))
         
         # Log health summary
         healthy_count = sum(1 for info in self.endpoint_health.values() if info['healthy'])
         logger.info(f"Endpoint health check completed: {healthy_count}/{len(self.api_urls)} endpoints healthy")
 
-    async def _check_single_endpoint_health(self, base_url: str):
+    async def _check_single_endpoint_health(self, base_url: str, now: datetime):
         """Check the health of a single endpoint."""
         endpoint_info = {
             'base_url': base_url,
             'healthy': False,
             'working_api_path': None,
-            'last_check': datetime.utcnow(),
+            'full_url': None,
+            'last_check': now,
             'error': None,
-            'response_time': None
+            'response_time': None,
+            'next_check': now,
+            'backoff': _HEALTHY_RECHECK_SECONDS
         }
         
-        # Try different API endpoints
-        api_endpoints = ["/api/v1/alerts", "/api/v2/alerts"]
+        # Probe both API paths concurrently; prefer the Prometheus API when both work
+        probes = await asyncio.gather(*(self._probe(base_url, api_path) for api_path in _API_PATHS))
         
-        for api_path in api_endpoints:
-            try:
-                url = f"{base_url.rstrip('/')}{api_path}"
-                start_time = time.time()
-                
-                response = requests.get(url, headers=self.headers, timeout=10)
-                response_time = time.time() - start_time
-                
-                if response.status_code == 200:
-                    # Validate that we get a proper response structure
-                    data = response.json()
-                    
-                    # Check if the response has the expected structure
-                    if api_path == "/api/v1/alerts":
-                        # Prometheus API should have data.alerts
-                        if isinstance(data.get('data', {}).get('alerts'), list):
-                            endpoint_info.update({
-                                'healthy': True,
-                                'working_api_path': api_path,
-                                'response_time': response_time,
-                                'error': None
-                            })
-                            logger.info(f"✅ {base_url} is healthy (Prometheus API, {response_time:.2f}s)")
-                            break
-                    else:
-                        # Alertmanager API should be a list
-                        if isinstance(data, list):
-                            endpoint_info.update({
-                                'healthy': True,
-                                'working_api_path': api_path,
-                                'response_time': response_time,
-                                'error': None
-                            })
-                            logger.info(f"✅ {base_url} is healthy (Alertmanager API, {response_time:.2f}s)")
-                            break
-                
-                elif response.status_code == 404:
-                    logger.debug(f"API path {api_path} not found on {base_url}")
-                    continue
-                else:
-                    logger.debug(f"HTTP {response.status_code} from {base_url}{api_path}")
-                    continue
-                    
-            except requests.Timeout:
-                logger.debug(f"Timeout connecting to {base_url}{api_path}")
-                endpoint_info['error'] = "Connection timeout"
-                continue
-            except requests.ConnectionError as e:
-                logger.debug(f"Connection error to {base_url}{api_path}: {e}")
-                endpoint_info['error'] = f"Connection error: {str(e)}"
-                continue
-            except Exception as e:
-                logger.debug(f"Unexpected error checking {base_url}{api_path}: {e}")
-                endpoint_info['error'] = f"Unexpected error: {str(e)}"
-                continue
+        for probe in probes:
+            if probe['valid']:
+                endpoint_info.update({
+                    'healthy': True,
+                    'working_api_path': probe['api_path'],
+                    'full_url': f"{base_url}{probe['api_path']}",
+                    'response_time': probe['response_time'],
+                    'error': None
+                })
+                api_type = "Prometheus API" if probe['api_path'] == "/api/v1/alerts" else "Alertmanager API"
+                logger.info(f"✅ {base_url} is healthy ({api_type}, {probe['response_time']:.2f}s)")
+                break
+            if probe['error']:
+                endpoint_info['error'] = probe['error']
+        
+        if not endpoint_info['healthy']:
+            endpoint_info['backoff'] = self._next_backoff(base_url)
+            logger.warning(f"❌ {base_url} is unhealthy: {endpoint_info['error']} (re-checking in {endpoint_info['backoff']:.0f}s)")
+        endpoint_info['next_check'] = now + timedelta(seconds=endpoint_info['backoff'])
         
         # Store the endpoint info
         self.endpoint_health[base_url] = endpoint_info
+
+    def _next_backoff(self, base_url: str) -> float:
+        """Re-check delay for an endpoint that just failed: doubles while it stays unhealthy."""
+        previous = self.endpoint_health.get(base_url)
+        if previous is None or previous['healthy']:
+            return _UNHEALTHY_BACKOFF_MIN_SECONDS
+        return min(_UNHEALTHY_BACKOFF_MAX_SECONDS, previous['backoff'] * 2)
+
+    async def _probe(self, base_url: str, api_path: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Fetch one alerts API path and check that it returns the expected structure."""
+        key = (base_url, api_path)
+        if use_cache:
+            cached = self._probe_cache.get(key)
+            if cached and time.monotonic() - cached[0] < _PROBE_TTL:
+                return cached[1]
         
-        if not endpoint_info['healthy']:
-            logger.warning(f"❌ {base_url} is unhealthy: {endpoint_info['error']}")
+        result = {
+            'api_path': api_path,
+            'valid': False,
+            'data': None,
+            'response_time': None,
+            'error': None
+        }
+        
+        try:
+            url = f"{base_url}{api_path}"
+            start_time = time.time()
+            
+            status, result['data'] = await self._get_json(url, timeout=10)
+            if status == 404:
+                logger.debug(f"API path {api_path} not found on {base_url}")
+            elif status != 200:
+                logger.debug(f"HTTP {status} from {base_url}{api_path}")
+            result['response_time'] = time.time() - start_time
+            
+            data = result['data']
+            if api_path == "/api/v1/alerts":
+                # Prometheus API should have data.alerts
+                result['valid'] = isinstance(data, dict) and isinstance(data.get('data', {}).get('alerts'), list)
+            else:
+                # Alertmanager API should be a list
+                result['valid'] = isinstance(data, list)
+                
+        except asyncio.TimeoutError:
+            logger.debug(f"Timeout connecting to {base_url}{api_path}")
+            result['error'] = "Connection timeout"
+        except aiohttp.ClientConnectionError as e:
+            logger.debug(f"Connection error to {base_url}{api_path}: {e}")
+            result['error'] = f"Connection error: {str(e)}"
+        except Exception as e:
+            logger.debug(f"Unexpected error checking {base_url}{api_path}: {e}")
+            result['error'] = f"Unexpected error: {str(e)}"
+        
+        self._probe_cache[key] = (time.monotonic(), result)
+        return result
+
+    async def _get_json(self, url: str, timeout: float, raise_for_status: bool = False) -> Tuple[int, Any]:
+        """GET a URL and decode the JSON body of a 200 response.
+        
+        Gateway errors (502/503/504) and connection failures are retried with
+        exponential backoff; timeouts are not, since each already took the full
+        timeout. Returns (status, data), with data None for non-200 responses.
+        """
+        session = await self._get_session()
+        
+        for attempt in range(_RETRY_ATTEMPTS):
+            final_attempt = attempt == _RETRY_ATTEMPTS - 1
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    if response.status not in _RETRY_STATUSES or final_attempt:
+                        if raise_for_status:
+                            response.raise_for_status()
+                        if response.status != 200:
+                            return response.status, None
+                        logger.debug(
+                            f"Response from {url}: {response.content_length} bytes on the wire "
+                            f"({response.headers.get('Content-Encoding', 'identity')})"
+                        )
+                        return response.status, await response.json(content_type=None, loads=orjson.loads)
+                    logger.debug(f"HTTP {response.status} from {url}, retrying")
+            except aiohttp.ClientConnectionError as e:
+                if final_attempt:
+                    raise
+                logger.debug(f"Connection error to {url}, retrying: {e}")
+            
+            await asyncio.sleep(_RETRY_BACKOFF_SECONDS * (2 ** attempt))
 
     def _get_healthy_endpoints(self) -> List[Dict[str, Any]]:
-        """Get list of healthy endpoints."""
+        """Get list of healthy endpoints, in configuration order."""
         healthy = []
-        for base_url, info in self.endpoint_health.items():
-            if info['healthy']:
+        for base_url in self.api_urls:
+            info = self.endpoint_health.get(base_url)
+            if info and info['healthy']:
                 healthy.append(info)
         return healthy
 
-    def _mark_endpoint_unhealthy(self, base_url: str, error: str):
+    def _mark_endpoint_unhealthy(self, base_url: str, error: str, now: datetime):
         """Mark an endpoint as unhealthy."""
         if base_url in self.endpoint_health:
+            backoff = self._next_backoff(base_url)
             self.endpoint_health[base_url].update({
                 'healthy': False,
                 'error': error,
-                'last_check': datetime.utcnow()
+                'last_check': now,
+                'next_check': now + timedelta(seconds=backoff),
+                'backoff': backoff
             })
             logger.warning(f"Marked {base_url} as unhealthy: {error}")
 
-    async def _fetch_from_healthy_endpoint(self, endpoint_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _fetch_from_healthy_endpoint(self, endpoint_info: Dict[str, Any], now: datetime) -> List[ParsedAlert]:
         """Fetch alerts from a known healthy endpoint."""
         base_url = endpoint_info['base_url']
         api_path = endpoint_info['working_api_path']
         
         try:
-            url = f"{base_url.rstrip('/')}{api_path}"
-            
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            _, data = await self._get_json(endpoint_info['full_url'], timeout=30, raise_for_status=True)
             
             # Parse based on API type
             if api_path == "/api/v1/alerts":
-                return self._parse_prometheus_api_response(data, base_url)
+                return await self._parse_prometheus_api_response(data, base_url, now)
             else:
-                return self._parse_alertmanager_api_response(data, base_url)
+                return await self._parse_alertmanager_api_response(data, base_url, now)
                 
         except Exception as e:
             logger.error(f"Error fetching from {base_url}: {e}")
             raise
 
-    def _parse_prometheus_api_response(self, data: Dict, source_instance: str) -> List[Dict[str, Any]]:
+    async def _parse_prometheus_api_response(self, data: Dict, source_instance: str, now: datetime) -> List[ParsedAlert]:
         """Parse Prometheus /api/v1/alerts response."""
         try:
             alerts = data.get('data', {}).get('alerts', [])
-            parsed_alerts = []
             
             logger.debug(f"Processing {len(alerts)} alerts from Prometheus API")
             
-            for alert in alerts:
-                # Only include firing/active alerts
-                state = alert.get('state', '').lower()
-                if state != 'firing':
-                    logger.debug(f"Skipping alert in state: {state}")
-                    continue
-                
-                parsed_alert = self._parse_prometheus_alert(alert, source_instance)
-                if parsed_alert:
-                    parsed_alerts.append(parsed_alert)
+            # Only include firing/active alerts
+            firing_alerts = [alert for alert in alerts if alert.get('state') in _FIRING_STATES]
+            parsed_alerts = await self._parse_alerts(_parse_prometheus_alert, firing_alerts, source_instance, now)
             
             logger.info(f"Parsed {len(parsed_alerts)} firing alerts from Prometheus API at {source_instance}")
             return parsed_alerts
@@ -234,29 +595,21 @@ class PrometheusService:
             logger.error(f"Error parsing Prometheus API response from {source_instance}: {e}")
             return []
 
-    def _parse_alertmanager_api_response(self, data: List, source_instance: str) -> List[Dict[str, Any]]:
+    async def _parse_alertmanager_api_response(self, data: List, source_instance: str, now: datetime) -> List[ParsedAlert]:
         """Parse Alertmanager /api/v2/alerts response."""
         try:
             if not isinstance(data, list):
                 logger.error(f"Expected list from Alertmanager API, got {type(data)}")
                 return []
             
-            parsed_alerts = []
-            
             logger.debug(f"Processing {len(data)} alerts from Alertmanager API")
             
-            for alert in data:
-                # Only include active alerts
-                status = alert.get('status', {})
-                state = status.get('state', '').lower()
-                
-                if state != 'active':
-                    logger.debug(f"Skipping alert in state: {state}")
-                    continue
-                
-                parsed_alert = self._parse_alertmanager_alert(alert, source_instance)
-                if parsed_alert:
-                    parsed_alerts.append(parsed_alert)
+            # Only include active alerts (status may be null in malformed payloads)
+            active_alerts = [
+                alert for alert in data
+                if (alert.get('status') or {}).get('state') in _ACTIVE_STATES
+            ]
+            parsed_alerts = await self._parse_alerts(_parse_alertmanager_alert, active_alerts, source_instance, now)
             
             logger.info(f"Parsed {len(parsed_alerts)} active alerts from Alertmanager API at {source_instance}")
             return parsed_alerts
@@ -265,199 +618,31 @@ class PrometheusService:
             logger.error(f"Error parsing Alertmanager API response from {source_instance}: {e}")
             return []
 
-    def _parse_prometheus_alert(self, alert: Dict[str, Any], source_instance: str) -> Dict[str, Any]:
-        """Parse a single Prometheus alert."""
-        try:
-            labels = alert.get('labels', {})
-            annotations = alert.get('annotations', {})
-            
-            alert_name = labels.get('alertname', 'Unknown')
-            instance = labels.get('instance', '')
-            
-            # Generate unique alert ID using fingerprint if available, otherwise hash
-            fingerprint = str(hash(f"{alert_name}{instance}{labels.get('job', '')}{source_instance}"))
-            alert_id = f"prometheus-{alert_name}-{fingerprint}"
-            
-            # Extract cluster information
-            cluster = self._extract_cluster_info(labels, instance)
-            
-            # Extract severity
-            severity = self._extract_severity(labels, annotations)
-            
-            # Get summary and description
-            summary = self._extract_summary(labels, annotations, alert_name)
-            description = annotations.get('description', annotations.get('summary', ''))
-            
-            parsed_alert = {
-                'alert_id': alert_id,
-                'alert_name': alert_name,
-                'cluster': cluster,
-                'pod': labels.get('pod', labels.get('kubernetes_pod_name')),
-                'instance': instance,
-                'severity': severity,
-                'summary': summary,
-                'description': description,
-                'started_at': self._parse_datetime(alert.get('activeAt')),
-                'generator_url': None,  # Not available in Prometheus API
-                'labels': labels,
-                'annotations': annotations,
-                'source': 'prometheus',
-                'source_instance': source_instance
-            }
-            
-            logger.debug(f"✅ Parsed Prometheus alert: {alert_name} from {cluster or 'unknown cluster'}")
-            return parsed_alert
-            
-        except Exception as e:
-            logger.error(f"Error parsing Prometheus alert: {e}")
-            logger.debug(f"Alert data: {alert}")
-            return None
-
-    def _parse_alertmanager_alert(self, alert: Dict[str, Any], source_instance: str) -> Dict[str, Any]:
-        """Parse a single Alertmanager alert."""
-        try:
-            labels = alert.get('labels', {})
-            annotations = alert.get('annotations', {})
-            
-            alert_name = labels.get('alertname', 'Unknown')
-            fingerprint = alert.get('fingerprint', str(hash(f"{str(labels)}{source_instance}")))
-            
-            alert_id = f"alertmanager-{alert_name}-{fingerprint}"
-            
-            # Extract cluster information
-            instance = labels.get('instance', '')
-            cluster = self._extract_cluster_info(labels, instance)
-            
-            # Extract severity
-            severity = self._extract_severity(labels, annotations)
-            
-            # Get summary and description
-            summary = self._extract_summary(labels, annotations, alert_name)
-            description = annotations.get('description', '')
-            
-            parsed_alert = {
-                'alert_id': alert_id,
-                'alert_name': alert_name,
-                'cluster': cluster,
-                'pod': labels.get('pod', labels.get('kubernetes_pod_name')),
-                'instance': instance,
-                'severity': severity,
-                'summary': summary,
-                'description': description,
-                'started_at': self._parse_datetime(alert.get('startsAt')),
-                'generator_url': alert.get('generatorURL'),
-                'labels': labels,
-                'annotations': annotations,
-                'source': 'prometheus',
-                'source_instance': source_instance
-            }
-            
-            logger.debug(f"✅ Parsed Alertmanager alert: {alert_name} from {cluster or 'unknown cluster'}")
-            return parsed_alert
-            
-        except Exception as e:
-            logger.error(f"Error parsing Alertmanager alert: {e}")
-            logger.debug(f"Alert data: {alert}")
-            return None
-
-    def _extract_cluster_info(self, labels: Dict, instance: str) -> str:
-        """Extract cluster information from labels or instance."""
-        # Try various cluster label names
-        cluster_labels = ['cluster', 'cluster_name', 'kubernetes_cluster', 'k8s_cluster', 'region']
+    async def _parse_alerts(self, parser: Callable[[Dict[str, Any], str, datetime], Optional[ParsedAlert]],
+                            alerts: List[Dict[str, Any]], source_instance: str, now: datetime) -> List[ParsedAlert]:
+        """Parse alerts, spreading large batches across worker processes."""
+        if len(alerts) <= _PARALLEL_PARSE_THRESHOLD:
+            return _parse_chunk(parser, alerts, source_instance, now)
         
-        for label in cluster_labels:
-            if label in labels and labels[label]:
-                return labels[label]
-        
-        # Try to extract from instance string
-        if instance:
-            cluster = self._extract_cluster_from_instance(instance)
-            if cluster:
-                return cluster
-        
-        # Try to extract from other common labels
-        if 'job' in labels:
-            return labels['job']
-        
-        return None
-
-    def _extract_severity(self, labels: Dict, annotations: Dict) -> str:
-        """Extract severity from labels or annotations."""
-        # Try labels first
-        severity_labels = ['severity', 'priority', 'level']
-        for label in severity_labels:
-            if label in labels and labels[label]:
-                return labels[label].lower()
-        
-        # Try annotations
-        for label in severity_labels:
-            if label in annotations and annotations[label]:
-                return annotations[label].lower()
-        
-        return 'info'  # Default severity
-
-    def _extract_summary(self, labels: Dict, annotations: Dict, alert_name: str) -> str:
-        """Extract summary from annotations or generate one."""
-        # Try annotations first
-        summary_fields = ['summary', 'message', 'description']
-        for field in summary_fields:
-            if field in annotations and annotations[field]:
-                return annotations[field]
-        
-        # Generate summary from alert name and labels
-        if 'instance' in labels:
-            return f"Alert {alert_name} on {labels['instance']}"
-        elif 'job' in labels:
-            return f"Alert {alert_name} in job {labels['job']}"
-        else:
-            return f"Prometheus alert: {alert_name}"
-
-    def _extract_cluster_from_instance(self, instance: str) -> str:
-        """Try to extract cluster information from instance string."""
-        if not instance:
-            return None
-            
-        import re
-        
-        # Common patterns for cluster extraction
-        cluster_patterns = [
-            r'[\w\-]*?(prod|production)[\w\-]*',
-            r'[\w\-]*?(staging|stage)[\w\-]*',
-            r'[\w\-]*?(dev|development)[\w\-]*',
-            r'[\w\-]*?(test|testing)[\w\-]*',
-            r'[\w\-]*?cluster[\w\-]*',
-            r'[\w\-]*?k8s[\w\-]*',
-            r'us-east[\w\-]*',
-            r'us-west[\w\-]*',
-            r'eu-[\w\-]*',
-        ]
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) - 1))
         
-        for pattern in cluster_patterns:
-            match = re.search(pattern, instance, re.IGNORECASE)
-            if match:
-                return match.group(0)
+        chunk_size = -(-len(alerts) // (os.cpu_count() or 1))  # ceil division
+        loop = asyncio.get_running_loop()
         
-        return None
-
-    def _parse_datetime(self, date_str: str) -> datetime:
-        """Parse datetime string from Prometheus/Alertmanager."""
-        if not date_str:
-            return datetime.utcnow()
         try:
-            # Handle RFC3339 format with nanoseconds
-            if '.' in date_str and 'Z' in date_str:
-                # Remove nanoseconds, keep microseconds
-                date_parts = date_str.split('.')
-                if len(date_parts) == 2:
-                    nanoseconds = date_parts[1].rstrip('Z')
-                    # Keep only first 6 digits (microseconds)
-                    microseconds = nanoseconds[:6].ljust(6, '0')
-                    date_str = f"{date_parts[0]}.{microseconds}Z"
-            
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except ValueError as e:
-            logger.warning(f"Failed to parse datetime '{date_str}': {e}")
-            return datetime.utcnow()
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(self._parse_pool, _parse_chunk, parser, alerts[start:start + chunk_size], source_instance, now)
+                for start in range(0, len(alerts), chunk_size)
+            ))
+        except Exception as e:
+            logger.warning(f"Parallel alert parsing failed, parsing serially: {e}")
+            # Stop the (possibly broken) pool's workers; the next large batch starts a fresh one
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+            return _parse_chunk(parser, alerts, source_instance, now)
+        
+        return list(itertools.chain.from_iterable(chunks))
 
     def get_endpoint_health_status(self) -> Dict[str, Any]:
         """Get the current health status of all endpoints."""
@@ -468,57 +653,50 @@ class PrometheusService:
             'endpoints': self.endpoint_health
         }
 
-    def test_connectivity(self) -> Dict[str, Any]:
-        """Test connectivity to all configured Prometheus endpoints (synchronous version)."""
-        results = {
+    async def test_connectivity(self, use_cache: bool = True) -> Dict[str, Any]:
+        """Test connectivity to all configured Prometheus endpoints.
+        
+        Probe results less than a second old are reused unless use_cache is False.
+        """
+        endpoint_results = await asyncio.gather(
+            *(self._test_endpoint_connectivity(base_url, use_cache) for base_url in self.api_urls)
+        )
+        successful = sum(1 for result in endpoint_results if result['status'] == 'success')
+        
+        return {
             'total_endpoints': len(self.api_urls),
-            'successful_endpoints': 0,
-            'failed_endpoints': 0,
-            'endpoint_results': []
+            'successful_endpoints': successful,
+            'failed_endpoints': len(endpoint_results) - successful,
+            'endpoint_results': list(endpoint_results)
+        }
+
+    async def _test_endpoint_connectivity(self, base_url: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Test connectivity to a single endpoint and count its active alerts."""
+        endpoint_result = {
+            'url': base_url,
+            'status': 'failed',
+            'working_endpoint': None,
+            'error': None,
+            'alert_count': 0
         }
         
-        for base_url in self.api_urls:
-            endpoint_result = {
-                'url': base_url,
-                'status': 'unknown',
-                'working_endpoint': None,
-                'error': None,
-                'alert_count': 0
-            }
-            
-            # Try different API endpoints
-            api_endpoints = ["/api/v1/alerts", "/api/v2/alerts"]
-            
-            for api_path in api_endpoints:
-                try:
-                    url = f"{base_url.rstrip('/')}{api_path}"
-                    response = requests.get(url, headers=self.headers, timeout=10)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        # Count alerts based on API type
-                        if api_path == "/api/v1/alerts":
-                            alerts = data.get('data', {}).get('alerts', [])
-                            active_alerts = [a for a in alerts if a.get('state') == 'firing']
-                        else:
-                            alerts = data if isinstance(data, list) else []
-                            active_alerts = [a for a in alerts if a.get('status', {}).get('state') == 'active']
-                        
-                        endpoint_result['status'] = 'success'
-                        endpoint_result['working_endpoint'] = api_path
-                        endpoint_result['alert_count'] = len(active_alerts)
-                        results['successful_endpoints'] += 1
-                        break
-                        
-                except Exception as e:
-                    endpoint_result['error'] = f"{api_path}: {str(e)}"
-                    continue
-            
-            if endpoint_result['status'] == 'unknown':
-                endpoint_result['status'] = 'failed'
-                results['failed_endpoints'] += 1
-            
-            results['endpoint_results'].append(endpoint_result)
+        probes = await asyncio.gather(*(self._probe(base_url, api_path, use_cache) for api_path in _API_PATHS))
+        
+        for probe in probes:
+            if probe['valid']:
+                # Count alerts based on API type
+                if probe['api_path'] == "/api/v1/alerts":
+                    alerts = probe['data']['data']['alerts']
+                    active_alerts = [a for a in alerts if a.get('state') in _FIRING_STATES]
+                else:
+                    alerts = probe['data']
+                    active_alerts = [a for a in alerts if (a.get('status') or {}).get('state') in _ACTIVE_STATES]
+                
+                endpoint_result['status'] = 'success'
+                endpoint_result['working_endpoint'] = probe['api_path']
+                endpoint_result['alert_count'] = len(active_alerts)
+                break
+            if probe['error']:
+                endpoint_result['error'] = f"{probe['api_path']}: {probe['error']}"
         
-        return results
\ No newline at end of file
+        return endpoint_result
@@ -1,8 +1,9 @@
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from croniter import croniter
+from datetime import datetime
+from typing import Dict
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import ProgrammingError
-from ..core.database import SessionLocal
+from ..core.database import SessionLocal, AsyncSessionLocal
 from ..models.config import CronConfig
 from .alert_service import AlertService
 import asyncio
@@ -12,9 +13,13 @@ logger = logging.getLogger(__name__)
 
 class SchedulerService:
     def __init__(self):
-        self.scheduler = BackgroundScheduler()
+        # Each job is one asyncio task on the application's event loop, so jobs
+        # must be added from async code (the startup hook or a route handler)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._expressions: Dict[str, str] = {}
+        self._next_runs: Dict[str, datetime] = {}
         self.alert_service = AlertService()
-        self.scheduler.start()
+        self.running = True
         self._jobs_loaded = False
         logger.info("📅 Scheduler service initialized (jobs will be loaded later)")
     
@@ -47,55 +52,54 @@ class SchedulerService:
     def _add_job(self, config: CronConfig):
         """Add a cron job to scheduler"""
         try:
-            trigger = CronTrigger.from_crontab(config.cron_expression)
-            self.scheduler.add_job(
-                func=self._sync_alerts_job_wrapper,
-                trigger=trigger,
-                id=f"job_{config.job_name}",
-                replace_existing=True
-            )
+            self._start_job(config.job_name, config.cron_expression)
             logger.info(f"➕ Added job {config.job_name} with expression {config.cron_expression}")
         except Exception as e:
             logger.error(f"❌ Error adding job {config.job_name}: {e}")
     
-    def _sync_alerts_job_wrapper(self):
-        """Wrapper to run async job in sync context"""
-        try:
-            logger.info("🔄 Running scheduled JSM alert sync...")
-            
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                # Run the async sync job
-                loop.run_until_complete(self._sync_alerts_job())
-                logger.info("✅ Scheduled JSM alert sync completed")
-            finally:
-                loop.close()
-                
-        except Exception as e:
-            logger.error(f"❌ Error in scheduled alert sync: {e}")
+    def _start_job(self, job_name: str, cron_expression: str):
+        """Start (or restart) the task that runs a job on its cron schedule"""
+        if not croniter.is_valid(cron_expression):
+            raise ValueError(f"Invalid cron expression: {cron_expression}")
+        self._cancel_job(job_name)
+        self._expressions[job_name] = cron_expression
+        self._tasks[job_name] = asyncio.create_task(
+            self._cron_loop(job_name, cron_expression), name=f"job_{job_name}"
+        )
+    
+    def _cancel_job(self, job_name: str) -> bool:
+        task = self._tasks.pop(job_name, None)
+        self._expressions.pop(job_name, None)
+        self._next_runs.pop(job_name, None)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+    
+    async def _cron_loop(self, job_name: str, cron_expression: str):
+        """Sleep until the next fire time, run the sync, repeat"""
+        while True:
+            # Re-based on the current time after every run, so fire times missed
+            # while a slow sync was running are skipped rather than queued up
+            next_run = croniter(cron_expression, datetime.now()).get_next(datetime)
+            self._next_runs[job_name] = next_run
+            await asyncio.sleep(max(0.0, (next_run - datetime.now()).total_seconds()))
+            await self._sync_alerts_job()
     
     async def _sync_alerts_job(self):
-        """Async job function to sync alerts"""
-        db = SessionLocal()
+        """Scheduled job: sync alerts"""
+        logger.info("🔄 Running scheduled JSM alert sync...")
         try:
-            await self.alert_service.sync_alerts(db)
+            async with AsyncSessionLocal() as db:
+                await self.alert_service.sync_alerts(db)
+            logger.info("✅ Scheduled JSM alert sync completed")
         except Exception as e:
-            logger.error(f"❌ Error in alert sync job: {e}")
-            raise
-        finally:
-            db.close()
+            logger.error(f"❌ Error in scheduled alert sync: {e}")
     
     def update_job(self, job_name: str, cron_expression: str):
         """Update a cron job"""
         try:
-            trigger = CronTrigger.from_crontab(cron_expression)
-            self.scheduler.modify_job(
-                job_id=f"job_{job_name}",
-                trigger=trigger
-            )
+            self._start_job(job_name, cron_expression)
             logger.info(f"🔄 Updated job {job_name} with expression {cron_expression}")
         except Exception as e:
             logger.error(f"❌ Error updating job {job_name}: {e}")
@@ -103,7 +107,8 @@ class SchedulerService:
     def remove_job(self, job_name: str):
         """Remove a cron job"""
         try:
-            self.scheduler.remove_job(f"job_{job_name}")
+            if not self._cancel_job(job_name):
+                raise KeyError(f"No job named {job_name}")
             logger.info(f"🗑️  Removed job {job_name}")
         except Exception as e:
             logger.error(f"❌ Error removing job {job_name}: {e}")
@@ -111,16 +116,23 @@ class SchedulerService:
     def get_job_status(self) -> dict:
         """Get status of all scheduled jobs"""
         jobs = []
-        for job in self.scheduler.get_jobs():
+        for job_name, cron_expression in self._expressions.items():
+            next_run = self._next_runs.get(job_name)
             jobs.append({
-                'id': job.id,
-                'name': job.name or job.id,
-                'next_run': job.next_run_time.isoformat() if job.next_run_time else None,
-                'trigger': str(job.trigger)
+                'id': f"job_{job_name}",
+                'name': job_name,
+                'next_run': next_run.isoformat() if next_run else None,
+                'trigger': f"cron[{cron_expression}]"
             })
         
         return {
-            'scheduler_running': self.scheduler.running,
+            'scheduler_running': self.running,
             'jobs_count': len(jobs),
             'jobs': jobs
-        }
\ No newline at end of file
+        }
+    
+    def shutdown(self):
+        """Cancel all job tasks"""
+        for job_name in list(self._tasks):
+            self._cancel_job(job_name)
+        self.running = False
\ No newline at end of file
@@ -1,9 +1,13 @@
+import asyncio
+import inspect
 import logging
 import traceback
 import time
-from typing import Any, Dict, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable
+from dataclasses import dataclass
+from collections import defaultdict, deque
 from functools import wraps
-from datetime import datetime
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
@@ -26,53 +30,103 @@ class DataExtractionError(Exception):
 def handle_extraction_errors(default_return=None):
     """Decorator for handling data extraction errors."""
     def decorator(func):
+        func_logger = logging.getLogger(func.__module__)
+        func_name = func.__name__
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                func_logger = logging.getLogger(func.__module__)
-                func_logger.error(f"Error in {func.__name__}: {e}")
-                func_logger.debug(f"Traceback: {traceback.format_exc()}")
+                func_logger.error(f"Error in {func_name}: {e}")
+                if func_logger.isEnabledFor(logging.DEBUG):
+                    func_logger.debug("Traceback: %s", traceback.format_exc())
                 return default_return
         return wrapper
     return decorator
 
-def handle_api_errors(max_retries: int = 3, retry_delay: float = 1.0):
-    """Decorator for handling API errors with retry logic."""
+def handle_api_errors(max_retries: int = 3, retry_delay: float = 1.0, max_backoff: float = 30.0):
+    """
+    Decorator for handling API errors with retry logic.
+    
+    Works on both plain and async functions; coroutines back off with
+    asyncio.sleep so retries never block the event loop.
+    """
     def decorator(func):
+        func_logger = logging.getLogger(func.__module__)
+        func_name = func.__name__
+        last_attempt = max_retries - 1
+        
+        def next_wait(attempt: int, e: Exception) -> float:
+            """Log a failed (non-final) attempt and return the backoff before the next one."""
+            wait_time = min(retry_delay * (1 << attempt), max_backoff)  # Exponential backoff
+            func_logger.warning(
+                f"API error in {func_name} (attempt {attempt + 1}/{max_retries}): {e}. "
+                f"Retrying in {wait_time}s..."
+            )
+            return wait_time
+        
+        def out_of_retries(e: Exception):
+            func_logger.error(f"API error in {func_name} after {max_retries} attempts: {e}")
+        
+        def non_retryable(e: Exception):
+            # Non-API errors should not be retried
+            func_logger.error(f"Non-retryable error in {func_name}: {e}")
+            if func_logger.isEnabledFor(logging.DEBUG):
+                func_logger.debug("Traceback: %s", traceback.format_exc())
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(max_retries):
+                    try:
+                        return await func(*args, **kwargs)
+                    except (JSMAPIError, GrafanaAPIError) as e:
+                        if attempt == last_attempt:
+                            out_of_retries(e)
+                            raise
+                        await asyncio.sleep(next_wait(attempt, e))
+                    except Exception as e:
+                        non_retryable(e)
+                        raise
+            return async_wrapper
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
-            
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
                 except (JSMAPIError, GrafanaAPIError) as e:
-                    last_exception = e
-                    func_logger = logging.getLogger(func.__module__)
-                    
-                    if attempt < max_retries - 1:
-                        wait_time = retry_delay * (2 ** attempt)  # Exponential backoff
-                        func_logger.warning(
-                            f"API error in {func.__name__} (attempt {attempt + 1}/{max_retries}): {e}. "
-                            f"Retrying in {wait_time}s..."
-                        )
-                        time.sleep(wait_time)
-                    else:
-                        func_logger.error(f"API error in {func.__name__} after {max_retries} attempts: {e}")
+                    if attempt == last_attempt:
+                        out_of_retries(e)
+                        raise
+                    time.sleep(next_wait(attempt, e))
                 except Exception as e:
-                    # Non-API errors should not be retried
-                    func_logger.error(f"Non-retryable error in {func.__name__}: {e}")
-                    func_logger.debug(f"Traceback: {traceback.format_exc()}")
+                    non_retryable(e)
                     raise
-            
-            # If we get here, all retries failed
-            raise last_exception
         return wrapper
     return decorator
 
-def validate_alert_data(alert_data: Dict[str, Any], source: str) -> bool:
+def _validate_grafana(alert_data: Dict[str, Any]) -> bool:
+    if 'labels' in alert_data:
+        return True
+    logger.warning("Missing required fields in grafana alert: ['labels']")
+    return False
+
+def _validate_jsm(alert_data: Dict[str, Any]) -> bool:
+    # JSM alerts may be wrapped in a 'data' envelope
+    payload: Any = alert_data['data'] if 'data' in alert_data else alert_data
+    if 'message' in payload:
+        return True
+    logger.warning("Missing required fields in jsm alert: ['message']")
+    return False
+
+_ALERT_VALIDATORS: Dict[str, Callable[[Dict[str, Any]], bool]] = {
+    'grafana': _validate_grafana,
+    'jsm': _validate_jsm
+}
+
+def validate_alert_data(alert_data: Any, source: str) -> bool:
     """
     Validate alert data structure.
     
@@ -87,33 +141,16 @@ def validate_alert_data(alert_data: Dict[str, Any], source: str) -> bool:
         logger.warning(f"Alert data is not a dictionary: {type(alert_data)}")
         return False
     
-    required_fields = {
-        'grafana': ['labels'],
-        'jsm': ['message']
-    }
-    
-    if source not in required_fields:
+    validator = _ALERT_VALIDATORS.get(source)
+    if validator is None:
         logger.warning(f"Unknown source '{source}', expected 'grafana' or 'jsm'")
         return False
     
-    # For JSM alerts, check if data is nested
-    if source == 'jsm':
-        # Check if it's a nested structure
-        if 'data' in alert_data:
-            alert_data = alert_data['data']
-    
-    missing_fields = []
-    for field in required_fields[source]:
-        if field not in alert_data:
-            missing_fields.append(field)
-    
-    if missing_fields:
-        logger.warning(f"Missing required fields in {source} alert: {missing_fields}")
-        return False
-    
-    return True
+    return validator(alert_data)
 
-def safe_dict_get(data: Dict, *keys, default=None):
+_MISSING = object()
+
+def safe_dict_get(data: Any, *keys: Any, default: Any = None) -> Any:
     """
     Safely get nested dictionary values.
     
@@ -125,18 +162,15 @@ def safe_dict_get(data: Dict, *keys, default=None):
     Returns:
         The value at the key path, or default if not found
     """
-    try:
-        result = data
-        for key in keys:
-            if isinstance(result, dict) and key in result:
-                result = result[key]
-            else:
-                return default
-        return result
-    except Exception:
-        return default
+    # Any, not Dict: the walk may reach non-dict leaves, which mypyc would reject
+    result: Any = data
+    for key in keys:
+        result = result.get(key, _MISSING) if isinstance(result, dict) else _MISSING
+        if result is _MISSING:
+            return default
+    return result
 
-def log_performance(func_name: str, start_time: float, details: Dict = None):
+def log_performance(func_name: str, start_time: float, details: Optional[Dict[str, Any]] = None):
     """Log performance metrics for a function."""
     end_time = time.time()
     duration = end_time - start_time
@@ -155,79 +189,106 @@ def log_performance(func_name: str, start_time: float, details: Dict = None):
     else:
         logger.debug(f"Performance: {log_data}")
 
+@dataclass(slots=True, frozen=True)
+class ErrorEntry:
+    """A warning or error recorded by ErrorContext."""
+    level: str
+    message: str
+    timestamp: float  # time.time(); formatted only in to_dict
+    exception: Optional[str] = None
+    exception_type: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flatten to the reporting format (details merged into the top level)."""
+        data: Dict[str, Any] = {
+            'message': self.message,
+            'timestamp': datetime.fromtimestamp(self.timestamp, tz=timezone.utc).isoformat(),
+            'level': self.level
+        }
+        if self.exception_type is not None:
+            data['exception'] = self.exception
+            data['exception_type'] = self.exception_type
+        if self.details:
+            data.update(self.details)
+        return data
+
 class ErrorContext:
     """Context manager for enhanced error handling and logging."""
     
-    def __init__(self, operation_name: str, logger_instance: logging.Logger = None):
+    def __init__(self, operation_name: str, logger_instance: Optional[logging.Logger] = None):
         self.operation_name = operation_name
         self.logger = logger_instance or logger
-        self.start_time = None
-        self.errors = []
+        self.start_time: Optional[float] = None
+        self.errors: List[ErrorEntry] = []
     
     def __enter__(self):
         self.start_time = time.time()
-        self.logger.debug(f"Starting operation: {self.operation_name}")
+        self.logger.debug("Starting operation: %s", self.operation_name)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = time.time() - self.start_time
+        start_time = self.start_time
+        duration = time.time() - start_time if start_time is not None else 0.0
         
+        # Lazy %-formatting: nothing is rendered for records the logger filters out
         if exc_type is None:
-            self.logger.debug(f"Operation '{self.operation_name}' completed successfully in {duration:.3f}s")
-        else:
-            self.logger.error(
-                f"Operation '{self.operation_name}' failed after {duration:.3f}s: "
-                f"{exc_type.__name__}: {exc_val}"
-            )
-            self.logger.debug(f"Traceback: {traceback.format_exc()}")
+            self.logger.debug("Operation '%s' completed successfully in %.3fs", self.operation_name, duration)
+            return False
+        
+        self.logger.error(
+            "Operation '%s' failed after %.3fs: %s: %s",
+            self.operation_name, duration, exc_type.__name__, exc_val
+        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Traceback: %s", traceback.format_exc())
         
         # Return False to propagate exceptions
         return False
     
-    def add_warning(self, message: str, details: Dict = None):
+    def add_warning(self, message: str, details: Optional[Dict[str, Any]] = None):
         """Add a warning to the error context."""
-        warning_data = {'message': message, 'timestamp': datetime.utcnow().isoformat()}
-        if details:
-            warning_data.update(details)
-        
-        self.errors.append(warning_data)
-        self.logger.warning(f"[{self.operation_name}] {message}")
+        self.errors.append(ErrorEntry(
+            level='warning',
+            message=message,
+            timestamp=time.time(),
+            details=details
+        ))
+        self.logger.warning("[%s] %s", self.operation_name, message)
     
-    def add_error(self, message: str, exception: Exception = None, details: Dict = None):
+    def add_error(self, message: str, exception: Optional[Exception] = None,
+                  details: Optional[Dict[str, Any]] = None):
         """Add an error to the error context."""
-        error_data = {
-            'message': message,
-            'timestamp': datetime.utcnow().isoformat(),
-            'level': 'error'
-        }
-        
-        if exception:
-            error_data['exception'] = str(exception)
-            error_data['exception_type'] = type(exception).__name__
-        
-        if details:
-            error_data.update(details)
-        
-        self.errors.append(error_data)
-        self.logger.error(f"[{self.operation_name}] {message}")
+        self.errors.append(ErrorEntry(
+            level='error',
+            message=message,
+            timestamp=time.time(),
+            exception=str(exception) if exception else None,
+            exception_type=type(exception).__name__ if exception else None,
+            details=details
+        ))
+        self.logger.error("[%s] %s", self.operation_name, message)
 
-def create_error_summary(errors: list, operation: str) -> Dict:
-    """Create a summary of errors for reporting."""
+def create_error_summary(errors: List[ErrorEntry], operation: str) -> Dict:
+    """Create a summary of ErrorContext entries for reporting."""
     if not errors:
         return {'status': 'success', 'operation': operation}
     
-    error_counts = {}
-    warnings = []
-    errors_list = []
+    error_counts: Dict[str, int] = {}
+    warnings: List[Dict[str, Any]] = []
+    errors_list: List[Dict[str, Any]] = []
     
+    # Single pass with bound-method aliases; counts keep first-seen level order
+    count_for = error_counts.get
+    add_error = errors_list.append
+    add_warning = warnings.append
     for error in errors:
-        level = error.get('level', 'warning')
-        error_counts[level] = error_counts.get(level, 0) + 1
-        
+        level = error.level
+        error_counts[level] = count_for(level, 0) + 1
         if level == 'error':
-            errors_list.append(error)
+            add_error(error.to_dict())
         else:
-            warnings.append(error)
+            add_warning(error.to_dict())
     
     return {
         'status': 'error' if errors_list else 'warning',
@@ -239,41 +300,51 @@ def create_error_summary(errors: list, operation: str) -> Dict:
     }
 
 # Monitoring and metrics collection
+_RECENT_ERRORS_PER_OPERATION = 100
+
+def _new_operation_stats() -> Dict[str, Any]:
+    return {
+        'count': 0,
+        'success_count': 0,
+        'total_duration': 0.0,
+        'min_duration': None,
+        'max_duration': None,
+        # Recent failures only; error_total keeps the true count
+        'errors': deque(maxlen=_RECENT_ERRORS_PER_OPERATION),
+        'error_total': 0
+    }
+
 class OperationMetrics:
     """Collect and track operation metrics."""
     
     def __init__(self):
-        self.operations = {}
+        self.operations = defaultdict(_new_operation_stats)
         self.start_time = time.time()
     
-    def record_operation(self, operation: str, duration: float, success: bool, details: Dict = None):
+    def record_operation(self, operation: str, duration: float, success: bool,
+                         details: Optional[Dict[str, Any]] = None):
         """Record an operation metric."""
-        if operation not in self.operations:
-            self.operations[operation] = {
-                'count': 0,
-                'success_count': 0,
-                'total_duration': 0.0,
-                'min_duration': float('inf'),
-                'max_duration': 0.0,
-                'errors': []
-            }
-        
         op_data = self.operations[operation]
         op_data['count'] += 1
         op_data['total_duration'] += duration
-        op_data['min_duration'] = min(op_data['min_duration'], duration)
-        op_data['max_duration'] = max(op_data['max_duration'], duration)
+        min_duration = op_data['min_duration']
+        if min_duration is None or duration < min_duration:
+            op_data['min_duration'] = duration
+        max_duration = op_data['max_duration']
+        if max_duration is None or duration > max_duration:
+            op_data['max_duration'] = duration
         
         if success:
             op_data['success_count'] += 1
         else:
             error_info = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': time.time(),
                 'duration': duration
             }
             if details:
                 error_info.update(details)
             op_data['errors'].append(error_info)
+            op_data['error_total'] += 1
     
     def get_summary(self) -> Dict:
         """Get a summary of all recorded metrics."""
@@ -288,14 +359,15 @@ class OperationMetrics:
                     'total_calls': op_data['count'],
                     'success_rate': op_data['success_count'] / op_data['count'],
                     'average_duration': op_data['total_duration'] / op_data['count'],
-                    'min_duration': op_data['min_duration'],
-                    'max_duration': op_data['max_duration'],
-                    'error_count': len(op_data['errors'])
+                    'min_duration': op_data['min_duration'] or 0.0,
+                    'max_duration': op_data['max_duration'] or 0.0,
+                    'error_count': op_data['error_total'],
+                    'recent_errors': list(op_data['errors'])
                 }
         
         return summary
     
-    def log_summary(self, logger_instance: logging.Logger = None):
+    def log_summary(self, logger_instance: Optional[logging.Logger] = None):
         """Log the metrics summary."""
         summary = self.get_summary()
         log_instance = logger_instance or logger
@@ -1,13 +1,18 @@
 import time
 import logging
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from typing import List, Dict, Any, Optional, Deque
+from datetime import datetime, timedelta, timezone
+from collections import defaultdict, Counter, deque
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Confidence buckets, highest first; _CONFIDENCE_BUCKET_INDEX maps the tens digit
+# of the percentage (0-10) to a bucket so recording a score is a single lookup
+_CONFIDENCE_BUCKETS = ('90-100%', '80-89%', '70-79%', '60-69%', '50-59%', 'Below 50%')
+_CONFIDENCE_BUCKET_INDEX = (5, 5, 5, 5, 5, 4, 3, 2, 1, 0, 0)
+
 class MatchType(Enum):
     """Enumeration of different match types."""
     EXACT_MATCH = "exact_match"
@@ -18,10 +23,25 @@ class MatchType(Enum):
     LOW_CONFIDENCE = "low_confidence"
     NO_MATCH = "no_match"
 
+# Match type lookup by value; unknown strings fall back to NO_MATCH
+_MATCH_TYPE_LOOKUP: Dict[str, MatchType] = {match_type.value: match_type for match_type in MatchType}
+
+def _new_alert_stats() -> Dict[str, Any]:
+    """Running per-alert-name aggregates, plus the most recent attempts."""
+    return {
+        'attempts': deque(maxlen=1024),
+        'total': 0,
+        'mt_counts': Counter(),
+        'success_count': 0,
+        'conf_sum': 0.0,
+        'conf_max': None,
+        'last_ts': None
+    }
+
 @dataclass
 class MatchingAttempt:
     """Record of a single matching attempt."""
-    timestamp: datetime
+    timestamp: float  # time.time(); formatted only when reported
     grafana_alert_name: str
     jsm_alert_id: Optional[str]
     confidence_score: float
@@ -42,39 +62,43 @@ class MatchingMetrics:
     manual_review_required: int = 0
     failed_matches: int = 0
     
-    # Processing times
-    processing_times: List[float] = field(default_factory=list)
+    # Processing times (running aggregates, constant memory per session)
+    pt_count: int = 0
+    pt_sum: float = 0.0
+    pt_min: float = float('inf')
+    pt_max: float = 0.0
     
-    # Confidence distribution
-    confidence_scores: List[float] = field(default_factory=list)
+    # Confidence aggregates and distribution (counts per _CONFIDENCE_BUCKETS entry)
+    conf_count: int = 0
+    conf_sum: float = 0.0
+    conf_buckets: List[int] = field(default_factory=lambda: [0] * len(_CONFIDENCE_BUCKETS))
     
     # Match type distribution
     match_type_counts: Dict[MatchType, int] = field(default_factory=lambda: defaultdict(int))
     
-    # Error tracking
-    errors: List[str] = field(default_factory=list)
+    # Error tracking: recent messages only, error_total keeps the true count
+    errors: Deque[str] = field(default_factory=lambda: deque(maxlen=100))
+    error_total: int = 0
     
-    # Timing information
-    start_time: datetime = field(default_factory=datetime.utcnow)
-    last_update: datetime = field(default_factory=datetime.utcnow)
+    # Timing information (epoch seconds; formatted only in get_summary)
+    start_time: float = field(default_factory=time.time)
+    last_update: float = field(default_factory=time.time)
     
-    # Detailed attempts (optional, for debugging)
-    detailed_attempts: List[MatchingAttempt] = field(default_factory=list)
-    
-    def __post_init__(self):
-        if not self.processing_times:
-            self.processing_times = []
-        if not self.confidence_scores:
-            self.confidence_scores = []
+    # Most recent attempts (for debugging), bounded to prevent memory issues
+    detailed_attempts: Deque[MatchingAttempt] = field(default_factory=lambda: deque(maxlen=1000))
     
     def record_attempt(self, attempt: MatchingAttempt):
         """Record a matching attempt."""
         self.total_attempts += 1
-        self.last_update = datetime.utcnow()
+        self.last_update = time.time()
         
         if attempt.success:
             self.successful_matches += 1
-            self.confidence_scores.append(attempt.confidence_score)
+            score = attempt.confidence_score
+            self.conf_count += 1
+            self.conf_sum += score
+            tens = int(score * 100) // 10
+            self.conf_buckets[_CONFIDENCE_BUCKET_INDEX[min(10, max(0, tens))]] += 1
             
             if attempt.confidence_score >= 0.85:
                 self.high_confidence_matches += 1
@@ -84,13 +108,18 @@ class MatchingMetrics:
             self.failed_matches += 1
             if attempt.error_message:
                 self.errors.append(attempt.error_message)
-        
-        self.processing_times.append(attempt.processing_time_ms)
+                self.error_total += 1
+        
+        ms = attempt.processing_time_ms
+        self.pt_count += 1
+        self.pt_sum += ms
+        if ms < self.pt_min:
+            self.pt_min = ms
+        if ms > self.pt_max:
+            self.pt_max = ms
         self.match_type_counts[attempt.match_type] += 1
         
-        # Store detailed attempt if tracking is enabled
-        if len(self.detailed_attempts) < 1000:  # Limit to prevent memory issues
-            self.detailed_attempts.append(attempt)
+        self.detailed_attempts.append(attempt)
     
     def get_match_rate(self) -> float:
         """Get overall match rate."""
@@ -106,50 +135,25 @@ class MatchingMetrics:
     
     def get_average_processing_time(self) -> float:
         """Get average processing time in milliseconds."""
-        if not self.processing_times:
+        if self.pt_count == 0:
             return 0.0
-        return sum(self.processing_times) / len(self.processing_times)
+        return self.pt_sum / self.pt_count
     
     def get_average_confidence(self) -> float:
         """Get average confidence score."""
-        if not self.confidence_scores:
+        if self.conf_count == 0:
             return 0.0
-        return sum(self.confidence_scores) / len(self.confidence_scores)
+        return self.conf_sum / self.conf_count
     
     def get_confidence_distribution(self) -> Dict[str, int]:
         """Get confidence score distribution."""
-        if not self.confidence_scores:
+        if self.conf_count == 0:
             return {}
-        
-        buckets = {
-            '90-100%': 0,
-            '80-89%': 0,
-            '70-79%': 0,
-            '60-69%': 0,
-            '50-59%': 0,
-            'Below 50%': 0
-        }
-        
-        for score in self.confidence_scores:
-            percentage = score * 100
-            if percentage >= 90:
-                buckets['90-100%'] += 1
-            elif percentage >= 80:
-                buckets['80-89%'] += 1
-            elif percentage >= 70:
-                buckets['70-79%'] += 1
-            elif percentage >= 60:
-                buckets['60-69%'] += 1
-            elif percentage >= 50:
-                buckets['50-59%'] += 1
-            else:
-                buckets['Below 50%'] += 1
-        
-        return buckets
+        return dict(zip(_CONFIDENCE_BUCKETS, self.conf_buckets))
     
     def get_summary(self) -> Dict[str, Any]:
         """Get comprehensive metrics summary."""
-        duration = (self.last_update - self.start_time).total_seconds()
+        duration = self.last_update - self.start_time
         
         return {
             'overview': {
@@ -160,13 +164,13 @@ class MatchingMetrics:
                 'high_confidence_rate': round(self.get_high_confidence_rate() * 100, 2),
                 'manual_review_required': self.manual_review_required,
                 'failed_matches': self.failed_matches,
-                'error_count': len(self.errors)
+                'error_count': self.error_total
             },
             'performance': {
                 'average_processing_time_ms': round(self.get_average_processing_time(), 2),
-                'total_processing_time_ms': round(sum(self.processing_times), 2),
-                'min_processing_time_ms': round(min(self.processing_times), 2) if self.processing_times else 0,
-                'max_processing_time_ms': round(max(self.processing_times), 2) if self.processing_times else 0,
+                'total_processing_time_ms': round(self.pt_sum, 2),
+                'min_processing_time_ms': round(self.pt_min, 2) if self.pt_count else 0,
+                'max_processing_time_ms': round(self.pt_max, 2) if self.pt_count else 0,
                 'total_duration_seconds': round(duration, 2)
             },
             'confidence': {
@@ -178,8 +182,8 @@ class MatchingMetrics:
                 for match_type, count in self.match_type_counts.items()
             },
             'timing': {
-                'start_time': self.start_time.isoformat(),
-                'last_update': self.last_update.isoformat(),
+                'start_time': datetime.fromtimestamp(self.start_time, tz=timezone.utc).isoformat(),
+                'last_update': datetime.fromtimestamp(self.last_update, tz=timezone.utc).isoformat(),
                 'duration_seconds': round(duration, 2)
             }
         }
@@ -189,18 +193,15 @@ class MetricsCollector:
     
     def __init__(self):
         self.session_metrics = MatchingMetrics()
-        self.historical_metrics = []
-        self.alert_specific_metrics = defaultdict(list)
+        # Keep only the last 10 sessions to prevent memory bloat
+        self.historical_metrics: Deque[MatchingMetrics] = deque(maxlen=10)
+        self.alert_specific_metrics = defaultdict(_new_alert_stats)
         
     def start_matching_session(self):
         """Start a new matching session."""
         if self.session_metrics.total_attempts > 0:
             # Save current session to history
             self.historical_metrics.append(self.session_metrics)
-            
-            # Keep only last 10 sessions to prevent memory bloat
-            if len(self.historical_metrics) > 10:
-                self.historical_metrics = self.historical_metrics[-10:]
         
         # Start new session
         self.session_metrics = MatchingMetrics()
@@ -220,13 +221,10 @@ class MetricsCollector:
         """Record a single matching attempt."""
         
         # Convert string match type to enum
-        try:
-            match_type_enum = MatchType(match_type)
-        except ValueError:
-            match_type_enum = MatchType.NO_MATCH
+        match_type_enum = _MATCH_TYPE_LOOKUP.get(match_type, MatchType.NO_MATCH)
         
         attempt = MatchingAttempt(
-            timestamp=datetime.utcnow(),
+            timestamp=time.time(),
             grafana_alert_name=grafana_alert_name,
             jsm_alert_id=jsm_alert_id,
             confidence_score=confidence_score,
@@ -241,7 +239,16 @@ class MetricsCollector:
         self.session_metrics.record_attempt(attempt)
         
         # Record alert-specific metrics
-        self.alert_specific_metrics[grafana_alert_name].append(attempt)
+        stats = self.alert_specific_metrics[grafana_alert_name]
+        stats['attempts'].append(attempt)
+        stats['total'] += 1
+        stats['mt_counts'][match_type_enum.value] += 1
+        stats['last_ts'] = attempt.timestamp
+        if success:
+            stats['success_count'] += 1
+            stats['conf_sum'] += confidence_score
+            if stats['conf_max'] is None or confidence_score > stats['conf_max']:
+                stats['conf_max'] = confidence_score
         
         # Log significant events
         if success and confidence_score >= 0.85:
@@ -278,23 +285,23 @@ class MetricsCollector:
     
     def get_alert_specific_metrics(self, alert_name: str) -> Dict[str, Any]:
         """Get metrics for a specific alert name."""
-        attempts = self.alert_specific_metrics.get(alert_name, [])
+        stats = self.alert_specific_metrics.get(alert_name)
         
-        if not attempts:
+        if not stats:
             return {'message': f'No data for alert: {alert_name}'}
         
-        successful_attempts = [a for a in attempts if a.success]
-        confidence_scores = [a.confidence_score for a in successful_attempts]
+        total = stats['total']
+        successes = stats['success_count']
         
         return {
             'alert_name': alert_name,
-            'total_attempts': len(attempts),
-            'successful_matches': len(successful_attempts),
-            'match_rate': round((len(successful_attempts) / len(attempts) * 100) if attempts else 0, 2),
-            'average_confidence': round((sum(confidence_scores) / len(confidence_scores) * 100) if confidence_scores else 0, 2),
-            'best_confidence': round(max(confidence_scores) * 100, 2) if confidence_scores else 0,
-            'match_types': dict(Counter(a.match_type.value for a in attempts)),
-            'last_attempt': attempts[-1].timestamp.isoformat() if attempts else None
+            'total_attempts': total,
+            'successful_matches': successes,
+            'match_rate': round(successes / total * 100, 2),
+            'average_confidence': round((stats['conf_sum'] / successes * 100) if successes else 0, 2),
+            'best_confidence': round(stats['conf_max'] * 100, 2) if successes else 0,
+            'match_types': dict(stats['mt_counts']),
+            'last_attempt': datetime.fromtimestamp(stats['last_ts'], tz=timezone.utc).isoformat()
         }
     
     def get_performance_insights(self) -> Dict[str, Any]:
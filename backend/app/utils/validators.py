@@ -1,13 +1,15 @@
 # Data validation utilities
-from typing import Dict, Any, List
+# Strictly annotated so the build can compile this module with mypyc (see Dockerfile)
+from typing import Dict, Any, Final, FrozenSet, List
+
+_GRAFANA_REQUIRED_FIELDS: Final[FrozenSet[str]] = frozenset({'labels', 'startsAt'})
+_JSM_REQUIRED_FIELDS: Final[FrozenSet[str]] = frozenset({'message', 'createdAt'})
 
 def validate_grafana_alert(alert: Dict[str, Any]) -> bool:
     """Validate Grafana alert structure"""
-    required_fields = ['labels', 'startsAt']
-    return all(field in alert for field in required_fields)
+    return alert.keys() >= _GRAFANA_REQUIRED_FIELDS
 
 def validate_jsm_alert(alert: Dict[str, Any]) -> bool:
     """Validate JSM alert structure"""
-    alert_data = alert.get('data', alert)
-    required_fields = ['message', 'createdAt']
-    return all(field in alert_data for field in required_fields)
\ No newline at end of file
+    alert_data: Dict[str, Any] = alert.get('data', alert)
+    return alert_data.keys() >= _JSM_REQUIRED_FIELDS
\ No newline at end of file
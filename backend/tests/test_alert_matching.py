@@ -3,36 +3,68 @@
 import unittest
 from unittest.mock import Mock, patch
 from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+from app.services.jsm_service import JSMService
+from app.services import matching_service
+from app.services.matching_service import AlertMatchingService
 
 class TestAlertMatching(unittest.TestCase):
     
-    def setUp(self):
-        self.jsm_service = JSMService("test-api-key")
-        self.matching_service = AlertMatchingService(confidence_threshold=0.70)
+    @classmethod
+    def setUpClass(cls):
+        # The services hold no per-test state, so build them once for the class
+        cls.jsm_service = JSMService()
+        cls.matching_service = AlertMatchingService(confidence_threshold=0.70)
     
-    def test_extract_alert_name_from_tags(self):
-        """Test alert name extraction from JSM tags."""
-        jsm_alert = {
+    # (description, JSM alert, expected alert name)
+    EXTRACTION_CASES = [
+        ('tag', {
             'data': {
                 'tags': ['alertname:pod-not-healthy-prometheus-metrics-platform-k8s', 'cluster:prod'],
                 'message': 'Test alert message'
             }
-        }
-        
-        result = self.jsm_service.extract_alert_name_from_jsm(jsm_alert)
-        self.assertEqual(result, 'pod-not-healthy-prometheus-metrics-platform-k8s')
-    
-    def test_extract_alert_name_from_message(self):
-        """Test alert name extraction from JSM message."""
-        jsm_alert = {
+        }, 'pod-not-healthy-prometheus-metrics-platform-k8s'),
+        ('message prefix', {
             'data': {
                 'tags': [],
-                'message': '[prod/monitoring] CPUHighUsage - CPU usage is above threshold'
+                'message': 'CPUHighUsage - CPU usage is above threshold in prod/monitoring'
             }
-        }
-        
-        result = self.jsm_service.extract_alert_name_from_jsm(jsm_alert)
-        self.assertEqual(result, 'CPUHighUsage')
+        }, 'CPUHighUsage'),
+        ('grafana summary', {
+            'data': {
+                'tags': [],
+                'message': '[Grafana]: *Summary*: DiskSpaceLow'
+            }
+        }, 'DiskSpaceLow'),
+        ('alias', {
+            'data': {
+                'tags': ['cluster:prod'],
+                'message': '',
+                'alias': 'NodeDown'
+            }
+        }, 'NodeDown'),
+        ('description', {
+            'data': {
+                'tags': [],
+                'message': '',
+                'description': 'AlertName: MemoryPressure'
+            }
+        }, 'MemoryPressure'),
+        ('tiny id fallback', {
+            'data': {
+                'tags': [],
+                'message': '',
+                'tinyId': '42'
+            }
+        }, 'jsm-alert-42'),
+    ]
+    
+    def test_extract_alert_name_matrix(self):
+        """Test alert name extraction across every JSM extraction strategy."""
+        for description, jsm_alert, expected in self.EXTRACTION_CASES:
+            with self.subTest(description):
+                result = self.jsm_service.extract_alert_name_from_jsm(jsm_alert)
+                self.assertEqual(result, expected)
     
     def test_high_confidence_match(self):
         """Test high confidence matching between similar alerts."""
@@ -55,7 +87,7 @@ class TestAlertMatching(unittest.TestCase):
             }
         }
         
-        confidence = self.matching_service.calculate_match_confidence(grafana_alert, jsm_alert)
+        confidence, _ = self.matching_service.calculate_match_confidence(grafana_alert, jsm_alert)
         self.assertGreater(confidence, 0.85)
     
     def test_low_confidence_no_match(self):
@@ -76,8 +108,77 @@ class TestAlertMatching(unittest.TestCase):
             }
         }
         
-        confidence = self.matching_service.calculate_match_confidence(grafana_alert, jsm_alert)
+        confidence, _ = self.matching_service.calculate_match_confidence(grafana_alert, jsm_alert)
         self.assertLess(confidence, 0.40)
 
+    def test_fuzzy_fallback_when_same_name_candidate_scores_low(self):
+        """Test a below-threshold same-name JSM alert does not hide a better differently named one."""
+        grafana_alert = {
+            'labels': {
+                'alertname': 'NodeMemoryPressure',
+                'severity': 'critical',
+                'cluster': 'prod-east'
+            },
+            'annotations': {'summary': 'Node memory pressure on prod-east'},
+            'startsAt': '2025-06-26T10:00:00Z'
+        }
+        stale_same_name = {
+            'id': 'j-stale',
+            'tinyId': '1',
+            'message': 'NodeMemoryPressure',
+            'tags': ['alertname:NodeMemoryPressure', 'cluster:dev-west'],
+            'priority': 'P5',
+            'createdAt': '2025-06-20T08:00:00Z'
+        }
+        renamed = {
+            'id': 'j-renamed',
+            'tinyId': '2',
+            'message': 'Node memory pressure on prod-east',
+            'tags': ['alertname:NodeMemoryPressureHigh', 'cluster:prod-east'],
+            'priority': 'P1',
+            'createdAt': '2025-06-26T10:01:00Z'
+        }
+        
+        stale_confidence, _ = self.matching_service.calculate_match_confidence(grafana_alert, stale_same_name)
+        self.assertLess(stale_confidence, self.matching_service.confidence_threshold)
+        
+        with patch.object(matching_service.settings, 'ENABLE_FUZZY_MATCHING', True, create=True):
+            result = self.matching_service.match_grafana_with_jsm([grafana_alert], [stale_same_name, renamed])
+        
+        self.assertEqual(result[0]['jsm_alert']['id'], 'j-renamed')
+        self.assertGreaterEqual(result[0]['match_confidence'], self.matching_service.confidence_threshold)
+
+class TestSequenceScoring(unittest.TestCase):
+    
+    @unittest.skipUnless(matching_service.RAPIDFUZZ_AVAILABLE, "rapidfuzz not installed")
+    def test_indel_ratio_never_below_difflib(self):
+        """Test the accepted drift: rapidfuzz ratios are >= SequenceMatcher's, higher on reorders."""
+        pairs = [
+            ('cpu high usage', 'cpuhighusage'),
+            ('disk-space-low', 'disk-pressure-low'),
+            ('prod-east', 'prod-west'),
+            ('-b-', 'ba-'),
+        ]
+        for a, b in pairs:
+            with self.subTest(a=a, b=b):
+                self.assertGreaterEqual(matching_service._sequence_ratio(a, b) + 1e-9,
+                                        SequenceMatcher(None, a, b).ratio())
+        
+        self.assertAlmostEqual(matching_service._sequence_ratio('-b-', 'ba-'), 2 / 3)
+        self.assertAlmostEqual(SequenceMatcher(None, '-b-', 'ba-').ratio(), 1 / 3)
+    
+    def test_score_cache_key_includes_scorer(self):
+        """Test persisted pair scores are keyed by scorer and version, not just alert content."""
+        class FakeCache(dict):
+            def set(self, key, value, expire=None):
+                self[key] = value
+        
+        service = AlertMatchingService(confidence_threshold=0.70)
+        service._score_cache = FakeCache()
+        service._cached_match_confidence({'labels': {'alertname': 'NodeDown'}}, {'data': {'tags': []}}, ('g', 'j'))
+        
+        self.assertEqual(list(service._score_cache),
+                         [(matching_service._SEQUENCE_SCORER, matching_service._SCORE_CACHE_VERSION, 'g', 'j')])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
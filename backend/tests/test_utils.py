@@ -0,0 +1,281 @@
+# tests/test_utils.py - Unit tests for the app.utils helpers
+
+import asyncio
+import inspect
+import logging
+import unittest
+from unittest.mock import patch
+from app.utils import error_handling
+from app.utils.error_handling import (
+    ErrorContext, ErrorEntry, JSMAPIError, OperationMetrics, create_error_summary,
+    handle_api_errors, handle_extraction_errors, safe_dict_get, validate_alert_data
+)
+from app.utils.metrics import MatchType, MetricsCollector
+from app.utils.validators import validate_grafana_alert, validate_jsm_alert
+
+class TestHandleApiErrors(unittest.TestCase):
+
+    def test_async_retries_without_blocking_sleep(self):
+        calls = []
+
+        @handle_api_errors(max_retries=3, retry_delay=1.0)
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise JSMAPIError('temporarily unavailable')
+            return 'ok'
+
+        self.assertTrue(inspect.iscoroutinefunction(flaky))
+        with patch.object(error_handling.asyncio, 'sleep') as async_sleep, \
+             patch.object(error_handling.time, 'sleep') as blocking_sleep:
+            self.assertEqual(asyncio.run(flaky()), 'ok')
+
+        self.assertEqual(len(calls), 3)
+        # Exponential backoff, and the event loop is never blocked
+        self.assertEqual([c.args[0] for c in async_sleep.call_args_list], [1.0, 2.0])
+        blocking_sleep.assert_not_called()
+
+    def test_non_api_errors_are_not_retried(self):
+        calls = []
+
+        @handle_api_errors(max_retries=3, retry_delay=0)
+        async def broken():
+            calls.append(1)
+            raise ValueError('bad payload')
+
+        with self.assertRaises(ValueError):
+            asyncio.run(broken())
+        self.assertEqual(len(calls), 1)
+
+    def test_final_attempt_reraises_without_sleeping(self):
+        calls = []
+
+        @handle_api_errors(max_retries=2, retry_delay=0.5)
+        def always_fails():
+            calls.append(1)
+            raise JSMAPIError('down')
+
+        with patch.object(error_handling.time, 'sleep') as blocking_sleep:
+            with self.assertRaises(JSMAPIError):
+                always_fails()
+
+        self.assertEqual(len(calls), 2)
+        # One backoff between the two attempts, none after the last
+        blocking_sleep.assert_called_once_with(0.5)
+
+    def test_traceback_formatted_only_when_debug_enabled(self):
+        @handle_extraction_errors(default_return='fallback')
+        def extract():
+            raise KeyError('alertname')
+
+        func_logger = logging.getLogger(extract.__module__)
+        self.addCleanup(func_logger.setLevel, func_logger.level)
+
+        with patch.object(error_handling.traceback, 'format_exc', return_value='tb') as format_exc:
+            func_logger.setLevel(logging.INFO)
+            self.assertEqual(extract(), 'fallback')
+            format_exc.assert_not_called()
+
+            func_logger.setLevel(logging.DEBUG)
+            self.assertEqual(extract(), 'fallback')
+            format_exc.assert_called_once()
+
+class TestErrorContext(unittest.TestCase):
+
+    def test_context_propagates_exceptions(self):
+        with self.assertLogs('app.utils.error_handling', level='ERROR') as logs:
+            with self.assertRaises(RuntimeError):
+                with ErrorContext('sync'):
+                    raise RuntimeError('failed')
+
+        self.assertIn("Operation 'sync' failed", logs.output[0])
+        self.assertIn('RuntimeError: failed', logs.output[0])
+
+    def test_summary_counts_warnings_and_errors(self):
+        with ErrorContext('sync') as ctx:
+            ctx.add_warning('slow response')
+            ctx.add_error('lookup failed', KeyError('cluster'), {'alert_id': 'g-2'})
+            ctx.add_warning('retrying')
+
+        summary = create_error_summary(ctx.errors, 'sync')
+
+        self.assertEqual(summary['status'], 'error')
+        self.assertEqual(summary['summary'], {'warning': 2, 'error': 1})
+        self.assertEqual(summary['total_issues'], 3)
+        self.assertEqual(summary['errors'][0]['exception_type'], 'KeyError')
+        self.assertEqual(summary['errors'][0]['alert_id'], 'g-2')
+        self.assertEqual([w['message'] for w in summary['warnings']], ['slow response', 'retrying'])
+        self.assertEqual(create_error_summary([], 'sync'), {'status': 'success', 'operation': 'sync'})
+
+    def test_error_entry_to_dict_merges_details(self):
+        entry = ErrorEntry(level='error', message='boom', timestamp=0.0,
+                           exception='bad', exception_type='ValueError', details={'alert_id': 'g-1'})
+
+        self.assertEqual(entry.to_dict(), {
+            'message': 'boom',
+            'timestamp': '1970-01-01T00:00:00+00:00',
+            'level': 'error',
+            'exception': 'bad',
+            'exception_type': 'ValueError',
+            'alert_id': 'g-1'
+        })
+        self.assertNotIn('exception', ErrorEntry(level='warning', message='w', timestamp=0.0).to_dict())
+
+class TestValidation(unittest.TestCase):
+
+    def test_required_field_validators(self):
+        self.assertTrue(validate_grafana_alert({'labels': {}, 'startsAt': '', 'extra': 1}))
+        self.assertFalse(validate_grafana_alert({'labels': {}}))
+        self.assertTrue(validate_jsm_alert({'data': {'message': 'x', 'createdAt': ''}}))
+        self.assertTrue(validate_jsm_alert({'message': 'x', 'createdAt': ''}))
+        self.assertFalse(validate_jsm_alert({'data': {'message': 'x'}}))
+
+    def test_safe_dict_get(self):
+        data = {'data': {'labels': {'cluster': 'prod'}, 'empty': None}}
+
+        self.assertEqual(safe_dict_get(data, 'data', 'labels', 'cluster'), 'prod')
+        self.assertEqual(safe_dict_get(data, 'data', 'missing', default='n/a'), 'n/a')
+        self.assertEqual(safe_dict_get(data, 'data', 'labels', 'cluster', 'deeper', default='n/a'), 'n/a')
+        self.assertEqual(safe_dict_get(None, 'data', default='n/a'), 'n/a')
+        # A stored None is a value, not a missing key
+        self.assertIsNone(safe_dict_get(data, 'data', 'empty', default='n/a'))
+
+    def test_validate_alert_data_dispatches_per_source(self):
+        self.assertTrue(validate_alert_data({'labels': {}}, 'grafana'))
+        self.assertFalse(validate_alert_data({'message': 'x'}, 'grafana'))
+        self.assertTrue(validate_alert_data({'data': {'message': 'x'}}, 'jsm'))
+        self.assertTrue(validate_alert_data({'message': 'x'}, 'jsm'))
+        self.assertFalse(validate_alert_data({'labels': {}}, 'jsm'))
+        self.assertFalse(validate_alert_data({'labels': {}}, 'prometheus'))
+        self.assertFalse(validate_alert_data(['labels'], 'grafana'))
+
+class TestMetrics(unittest.TestCase):
+
+    def test_processing_time_aggregates(self):
+        collector = MetricsCollector()
+        self.assertEqual(collector.get_current_session_metrics()['performance']['min_processing_time_ms'], 0)
+
+        for ms in (4.0, 6.0, 2.0):
+            collector.record_match_attempt('NodeDown', 'j-1', 0.9, 'exact_match', ms, True)
+
+        performance = collector.get_current_session_metrics()['performance']
+        self.assertEqual(performance['average_processing_time_ms'], 4.0)
+        self.assertEqual(performance['total_processing_time_ms'], 12.0)
+        self.assertEqual(performance['min_processing_time_ms'], 2.0)
+        self.assertEqual(performance['max_processing_time_ms'], 6.0)
+
+    def test_confidence_distribution_buckets(self):
+        collector = MetricsCollector()
+        self.assertEqual(collector.session_metrics.get_confidence_distribution(), {})
+
+        for score in (0.92, 1.0, 0.75, 0.3):
+            collector.record_match_attempt('NodeDown', 'j-1', score, 'content_similarity', 1.0, True)
+        # Failed attempts never land in a bucket
+        collector.record_match_attempt('NodeDown', None, 0.95, 'no_match', 1.0, False)
+
+        self.assertEqual(collector.session_metrics.get_confidence_distribution(), {
+            '90-100%': 2, '80-89%': 0, '70-79%': 1, '60-69%': 0, '50-59%': 0, 'Below 50%': 1
+        })
+
+    def test_attempts_and_history_are_bounded(self):
+        collector = MetricsCollector()
+        for _ in range(1100):
+            collector.record_match_attempt('NodeDown', 'j-1', 0.9, 'exact_match', 1.0, True)
+        self.assertEqual(len(collector.session_metrics.detailed_attempts), 1000)
+        self.assertEqual(collector.session_metrics.total_attempts, 1100)
+
+        for _ in range(12):
+            collector.start_matching_session()
+            collector.record_match_attempt('NodeDown', 'j-1', 0.9, 'exact_match', 1.0, True)
+
+        self.assertEqual(collector.get_historical_summary()['sessions_count'], 10)
+
+    def test_match_types_resolve_by_value(self):
+        collector = MetricsCollector()
+        collector.record_match_attempt('NodeDown', 'j-1', 0.9, 'cluster_match', 1.0, True)
+        collector.record_match_attempt('NodeDown', None, 0.0, 'not-a-match-type', 1.0, False)
+
+        self.assertEqual(dict(collector.session_metrics.match_type_counts),
+                         {MatchType.CLUSTER_MATCH: 1, MatchType.NO_MATCH: 1})
+
+    def test_reported_timestamps_are_utc(self):
+        collector = MetricsCollector()
+        collector.record_match_attempt('NodeDown', 'j-1', 0.9, 'exact_match', 1.0, True)
+
+        timing = collector.get_current_session_metrics()['timing']
+        self.assertTrue(timing['start_time'].endswith('+00:00'))
+        self.assertTrue(timing['last_update'].endswith('+00:00'))
+        self.assertTrue(collector.get_alert_specific_metrics('NodeDown')['last_attempt'].endswith('+00:00'))
+
+    def test_alert_specific_aggregates(self):
+        collector = MetricsCollector()
+        collector.record_match_attempt('NodeDown', None, 0.0, 'no_match', 2.0, False, error_message='miss')
+        collector.record_match_attempt('NodeDown', 'j-1', 0.92, 'high_confidence', 4.0, True)
+        collector.record_match_attempt('NodeDown', 'j-2', 0.78, 'manual_review', 6.0, True)
+
+        alert = collector.get_alert_specific_metrics('NodeDown')
+
+        self.assertEqual(alert['total_attempts'], 3)
+        self.assertEqual(alert['successful_matches'], 2)
+        self.assertEqual(alert['match_rate'], 66.67)
+        self.assertEqual(alert['average_confidence'], 85.0)
+        self.assertEqual(alert['best_confidence'], 92.0)
+        self.assertEqual(alert['match_types'], {'no_match': 1, 'high_confidence': 1, 'manual_review': 1})
+        self.assertIn('message', collector.get_alert_specific_metrics('DiskFull'))
+
+    def test_operation_durations_track_min_and_max(self):
+        metrics = OperationMetrics()
+        for duration in (0.2, 0.1, 0.4):
+            metrics.record_operation('fetch', duration, success=True)
+
+        summary = metrics.get_summary()['operations']['fetch']
+
+        self.assertEqual(summary['total_calls'], 3)
+        self.assertEqual(summary['min_duration'], 0.1)
+        self.assertEqual(summary['max_duration'], 0.4)
+        self.assertEqual(summary['success_rate'], 1.0)
+        self.assertNotIn('idle', metrics.get_summary()['operations'])
+
+    def test_operation_errors_are_capped_but_counted(self):
+        cap = error_handling._RECENT_ERRORS_PER_OPERATION
+        metrics = OperationMetrics()
+        for i in range(cap + 50):
+            metrics.record_operation('fetch', 0.1, success=False, details={'attempt': i})
+
+        summary = metrics.get_summary()['operations']['fetch']
+
+        self.assertEqual(summary['error_count'], cap + 50)
+        self.assertEqual(len(summary['recent_errors']), cap)
+        self.assertEqual(summary['recent_errors'][-1]['attempt'], cap + 49)
+
+    def test_session_errors_are_capped_but_counted(self):
+        collector = MetricsCollector()
+        for i in range(150):
+            collector.record_match_attempt('NodeDown', None, 0.0, 'no_match', 1.0, False, error_message=f'miss {i}')
+
+        session = collector.session_metrics
+        self.assertEqual(session.error_total, 150)
+        self.assertEqual(len(session.errors), session.errors.maxlen)
+        self.assertEqual(session.errors[-1], 'miss 149')
+        self.assertEqual(collector.get_current_session_metrics()['overview']['error_count'], 150)
+
+    def test_historical_summary_averages_per_session(self):
+        collector = MetricsCollector()
+        self.assertIn('message', collector.get_historical_summary())
+
+        collector.record_match_attempt('NodeDown', 'j-1', 0.9, 'exact_match', 10.0, True)
+        collector.start_matching_session()
+        collector.record_match_attempt('DiskFull', None, 0.0, 'no_match', 4.0, False)
+        collector.start_matching_session()
+
+        history = collector.get_historical_summary()
+
+        self.assertEqual(history['sessions_count'], 2)
+        self.assertEqual(history['total_attempts'], 2)
+        self.assertEqual(history['overall_match_rate'], 50.0)
+        self.assertEqual(history['average_processing_time_ms'], 7.0)
+        # A session with no successful matches contributes 0 to the confidence mean
+        self.assertEqual(history['average_confidence'], 45.0)
+
+if __name__ == '__main__':
+    unittest.main()
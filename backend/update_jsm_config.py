@@ -5,7 +5,52 @@ Usage: python update_jsm_config.py
 """
 
 import os
+import re
 import sys
+from dataclasses import dataclass
+from typing import Callable
+
+# Non-secret settings written with their defaults; these stay unquoted in .env
+DEFAULT_SETTINGS = {
+    'USE_JSM_MODE': 'true',
+    'ENABLE_AUTO_CLOSE': 'true',
+    'ALERT_MATCH_CONFIDENCE_THRESHOLD': '50.0',
+    'ALERT_MATCH_TIME_WINDOW_MINUTES': '15',
+    'GRAFANA_SYNC_INTERVAL_SECONDS': '300',
+    'FILTER_NON_PROD_ALERTS': 'true'
+}
+
+@dataclass(frozen=True)
+class Prompt:
+    """A required setting asked for interactively unless a usable value already exists"""
+    key: str
+    label: str
+    text: str
+    required_message: str
+    can_reuse: Callable[[str], bool]
+    secret: bool = False  # Secrets are only reused after confirmation and never echoed
+
+PROMPTS = [
+    Prompt('JSM_CLOUD_ID', 'Cloud ID', "Enter your JSM Cloud ID (from tenant_info API)",
+           "Cloud ID is required for JSM integration", lambda v: v != 'your_actual_cloud_id'),
+    Prompt('JIRA_URL', 'Jira URL', "Enter your Jira URL (e.g., https://yourcompany.atlassian.net)",
+           "Jira URL is required", lambda v: 'atlassian.net' in v),
+    Prompt('JIRA_USER_EMAIL', 'email', "Enter your Jira user email",
+           "User email is required", lambda v: '@' in v),
+    Prompt('JIRA_API_TOKEN', 'API token', "Enter your Jira API token",
+           "API token is required", lambda v: len(v) > 10, secret=True),
+    Prompt('GRAFANA_API_KEY', 'Grafana API key', "Enter your Grafana API key",
+           "Grafana API key is required", lambda v: len(v) > 10, secret=True),
+]
+
+# KEY=value assignment at the start of a line
+ENV_LINE_RE = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)\s*=(.*)$')
+# KEY=value or KEY="value", capturing the key and the unquoted value
+ENV_VALUE_RE = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)\s*=\s*"?([^"\n]*)"?\s*$')
+
+def format_env_line(key, value):
+    """Format a KEY=value line, quoting everything except the default settings"""
+    return f'{key}={value}' if key in DEFAULT_SETTINGS else f'{key}="{value}"'
 
 def update_env_file():
     """Update .env file with JSM-specific configuration"""
@@ -15,22 +60,11 @@ def update_env_file():
         print("❌ .env.example file not found")
         return False
     
-    # Read .env.example
-    with open('.env.example', 'r') as f:
-        example_content = f.read()
-    
-    # Get current .env content if it exists
-    env_content = ""
+    # Extract existing values from the current .env if it exists
+    existing_values = {}
     if os.path.exists('.env'):
         with open('.env', 'r') as f:
-            env_content = f.read()
-    
-    # Extract existing values
-    existing_values = {}
-    for line in env_content.split('\n'):
-        if '=' in line and not line.startswith('#'):
-            key, value = line.split('=', 1)
-            existing_values[key] = value.strip('"')
+            existing_values = dict(match.groups() for match in map(ENV_VALUE_RE.match, f) if match)
     
     # Prompt for JSM-specific values
     jsm_config = {}
@@ -38,120 +72,50 @@ def update_env_file():
     print("🔧 JSM Configuration Setup")
     print("=" * 30)
     
-    # JSM Cloud ID
-    current_cloud_id = existing_values.get('JSM_CLOUD_ID', '')
-    if current_cloud_id and current_cloud_id != 'your_actual_cloud_id':
-        jsm_config['JSM_CLOUD_ID'] = current_cloud_id
-        print(f"✅ Using existing Cloud ID: {current_cloud_id}")
-    else:
-        cloud_id = input("Enter your JSM Cloud ID (from tenant_info API): ").strip()
-        if cloud_id:
-            jsm_config['JSM_CLOUD_ID'] = cloud_id
-        else:
-            print("❌ Cloud ID is required for JSM integration")
-            return False
-    
-    # Jira URL
-    current_jira_url = existing_values.get('JIRA_URL', '')
-    if current_jira_url and 'atlassian.net' in current_jira_url:
-        jsm_config['JIRA_URL'] = current_jira_url
-        print(f"✅ Using existing Jira URL: {current_jira_url}")
-    else:
-        jira_url = input("Enter your Jira URL (e.g., https://yourcompany.atlassian.net): ").strip()
-        if jira_url:
-            jsm_config['JIRA_URL'] = jira_url
-        else:
-            print("❌ Jira URL is required")
-            return False
-    
-    # Email
-    current_email = existing_values.get('JIRA_USER_EMAIL', '')
-    if current_email and '@' in current_email:
-        jsm_config['JIRA_USER_EMAIL'] = current_email
-        print(f"✅ Using existing email: {current_email}")
-    else:
-        email = input("Enter your Jira user email: ").strip()
-        if email:
-            jsm_config['JIRA_USER_EMAIL'] = email
-        else:
-            print("❌ User email is required")
-            return False
-    
-    # API Token
-    current_token = existing_values.get('JIRA_API_TOKEN', '')
-    if current_token and len(current_token) > 10:
-        choice = input(f"Use existing API token? (y/n): ").strip().lower()
-        if choice == 'y':
-            jsm_config['JIRA_API_TOKEN'] = current_token
-            print("✅ Using existing API token")
-        else:
-            token = input("Enter your Jira API token: ").strip()
-            if token:
-                jsm_config['JIRA_API_TOKEN'] = token
-            else:
-                print("❌ API token is required")
-                return False
-    else:
-        token = input("Enter your Jira API token: ").strip()
-        if token:
-            jsm_config['JIRA_API_TOKEN'] = token
-        else:
-            print("❌ API token is required")
-            return False
-    
-    # Grafana API Key
-    current_grafana_key = existing_values.get('GRAFANA_API_KEY', '')
-    if current_grafana_key and len(current_grafana_key) > 10:
-        choice = input(f"Use existing Grafana API key? (y/n): ").strip().lower()
-        if choice == 'y':
-            jsm_config['GRAFANA_API_KEY'] = current_grafana_key
-            print("✅ Using existing Grafana API key")
-        else:
-            grafana_key = input("Enter your Grafana API key: ").strip()
-            if grafana_key:
-                jsm_config['GRAFANA_API_KEY'] = grafana_key
-            else:
-                print("❌ Grafana API key is required")
-                return False
-    else:
-        grafana_key = input("Enter your Grafana API key: ").strip()
-        if grafana_key:
-            jsm_config['GRAFANA_API_KEY'] = grafana_key
+    for prompt in PROMPTS:
+        current = existing_values.get(prompt.key, '')
+        if current and prompt.can_reuse(current):
+            if not prompt.secret:
+                jsm_config[prompt.key] = current
+                print(f"✅ Using existing {prompt.label}: {current}")
+                continue
+            choice = input(f"Use existing {prompt.label}? (y/n): ").strip().lower()
+            if choice == 'y':
+                jsm_config[prompt.key] = current
+                print(f"✅ Using existing {prompt.label}")
+                continue
+        
+        value = input(f"{prompt.text}: ").strip()
+        if value:
+            jsm_config[prompt.key] = value
         else:
-            print("❌ Grafana API key is required")
+            print(f"❌ {prompt.required_message}")
             return False
     
     # Update other values with defaults
-    jsm_config.update({
-        'USE_JSM_MODE': 'true',
-        'ENABLE_AUTO_CLOSE': 'true',
-        'ALERT_MATCH_CONFIDENCE_THRESHOLD': '50.0',
-        'ALERT_MATCH_TIME_WINDOW_MINUTES': '15',
-        'GRAFANA_SYNC_INTERVAL_SECONDS': '300',
-        'FILTER_NON_PROD_ALERTS': 'true'
-    })
-    
-    # Create new .env content
-    new_content = example_content
-    
-    for key, value in jsm_config.items():
-        # Replace placeholder values with actual values
-        new_content = new_content.replace(f'{key}="your_actual_{key.lower()}"', f'{key}="{value}"')
-        new_content = new_content.replace(f'{key}=your_actual_{key.lower()}', f'{key}="{value}"')
-        new_content = new_content.replace(f'{key}="cfe6e1fe-26bb-4354-9cf1-fffaf23319db"', f'{key}="{value}"')
-        
-        # Handle boolean and numeric values
-        if key in ['USE_JSM_MODE', 'ENABLE_AUTO_CLOSE', 'FILTER_NON_PROD_ALERTS']:
-            new_content = new_content.replace(f'{key}=true', f'{key}={value}')
-        elif key in ['ALERT_MATCH_CONFIDENCE_THRESHOLD', 'ALERT_MATCH_TIME_WINDOW_MINUTES', 'GRAFANA_SYNC_INTERVAL_SECONDS']:
-            # Replace any existing numeric values
-            import re
-            pattern = f'{key}=\\d+(\\.\\d+)?'
-            new_content = re.sub(pattern, f'{key}={value}', new_content)
-    
-    # Write new .env file
-    with open('.env', 'w') as f:
-        f.write(new_content)
+    jsm_config.update(DEFAULT_SETTINGS)
+    
+    # Stream .env.example into .env.new, rewriting configured keys, then swap it in
+    # atomically so an interrupted run never leaves a truncated .env behind.
+    # .env holds API tokens, so the new file is created owner-only (0600)
+    try:
+        if os.path.exists('.env.new'):
+            os.remove('.env.new')
+        fd = os.open('.env.new', os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        with open('.env.example', 'r') as example, os.fdopen(fd, 'w') as output:
+            for line in example:
+                match = ENV_LINE_RE.match(line)
+                if match and match.group(1) in jsm_config:
+                    key = match.group(1)
+                    output.write(format_env_line(key, jsm_config[key]) + '\n')
+                else:
+                    output.write(line)
+        os.replace('.env.new', '.env')
+    except OSError as e:
+        if os.path.exists('.env.new'):
+            os.remove('.env.new')
+        print(f"❌ Failed to write .env file: {e}")
+        return False
     
     print("\n✅ .env file updated successfully!")
     print("\n📋 Configuration Summary:")
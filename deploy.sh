@@ -0,0 +1,190 @@
+#!/bin/bash
+set -e
+
+echo "🚀 Deploying Devo Alert Manager v1.0..."
+
+# Function to check if command exists
+command_exists() {
+    command -v "$1" >/dev/null 2>&1
+}
+
+# Function to poll a command with exponential backoff (1s, 2s, 4s, ... capped at 8s)
+# until it succeeds or the total wait budget (default 60s) is used up
+wait_for() {
+    local budget=${WAIT_TIMEOUT:-60}
+    local delay=1
+    local waited=0
+    until "$@" >/dev/null 2>&1; do
+        if [ "$waited" -ge "$budget" ]; then
+            return 1
+        fi
+        sleep "$delay"
+        waited=$((waited + delay))
+        delay=$((delay * 2))
+        if [ "$delay" -gt 8 ]; then
+            delay=8
+        fi
+    done
+    return 0
+}
+
+# Function to wait until an HTTP endpoint answers successfully
+wait_http() {
+    wait_for curl -fsS --max-time 1 "$1"
+}
+
+# Check prerequisites
+echo "📋 Checking prerequisites..."
+
+if ! command_exists docker; then
+    echo "❌ Docker is not installed. Please install Docker first."
+    exit 1
+fi
+
+if ! command_exists docker-compose; then
+    echo "❌ Docker Compose is not installed. Please install Docker Compose first."
+    exit 1
+fi
+
+# Check if .env file exists
+if [ ! -f .env ]; then
+    echo "❌ .env file not found. Please copy .env.example to .env and configure it."
+    exit 1
+fi
+
+# Validate critical environment variables without sourcing .env
+# (docker-compose reads .env itself, so nothing needs to be exported here)
+echo "🔍 Validating configuration..."
+
+required_vars=(JSM_CLOUD_ID JIRA_API_TOKEN GRAFANA_API_KEY)
+missing_vars=()
+for var in "${required_vars[@]}"; do
+    if ! grep -qE "^${var}=\"?[^\"[:space:]]" .env; then
+        missing_vars+=("$var")
+    fi
+done
+
+if [ ${#missing_vars[@]} -ne 0 ]; then
+    echo "❌ Missing required settings in .env file: ${missing_vars[*]}"
+    exit 1
+fi
+
+echo "✅ Configuration validated"
+
+# Stop existing containers
+echo "🛑 Stopping existing containers..."
+docker-compose down
+
+# Pull latest images
+echo "📥 Pulling latest images..."
+docker-compose pull
+
+# Build and start services
+echo "🏗️  Building and starting services..."
+docker-compose up -d --build
+
+# Wait for services to be ready
+echo "⏳ Waiting for services to start..."
+
+# Check service health
+echo "🏥 Checking service health..."
+
+# Backend, frontend and database checks are independent, so poll them in parallel
+wait_http http://localhost:8000/health &
+BACKEND_PID=$!
+wait_http http://localhost:3000 &
+FRONTEND_PID=$!
+wait_for docker-compose exec -T postgres pg_isready -U user -d alertdb &
+DB_PID=$!
+
+BACKEND_STATUS=0
+wait $BACKEND_PID || BACKEND_STATUS=$?
+FRONTEND_STATUS=0
+wait $FRONTEND_PID || FRONTEND_STATUS=$?
+DB_STATUS=0
+wait $DB_PID || DB_STATUS=$?
+
+# Check backend health
+if [ "$BACKEND_STATUS" -eq 0 ]; then
+    echo "✅ Backend service is healthy"
+else
+    echo "❌ Backend service health check failed"
+    echo "📋 Backend logs:"
+    docker-compose logs backend | tail -20
+    exit 1
+fi
+
+# Check frontend
+if [ "$FRONTEND_STATUS" -eq 0 ]; then
+    echo "✅ Frontend service is healthy"
+else
+    echo "❌ Frontend service health check failed"
+    echo "📋 Frontend logs:"
+    docker-compose logs frontend | tail -20
+    exit 1
+fi
+
+# Check database connectivity
+echo "🗄️  Checking database connectivity..."
+if [ "$DB_STATUS" -eq 0 ]; then
+    echo "✅ Database is ready"
+else
+    echo "❌ Database connectivity check failed"
+    exit 1
+fi
+
+# Test JSM connectivity
+echo "🔌 Testing JSM connectivity..."
+if docker-compose exec -T backend python -c "
+import asyncio
+import sys
+sys.path.append('/app')
+from app.core.http import get_http_session
+from app.services.jsm_service import JSMService
+
+async def test():
+    try:
+        service = JSMService(session=get_http_session())
+        # Uses the configured/cached Cloud ID when available, tenant_info otherwise
+        cloud_id = await service.get_cloud_id()
+        if not cloud_id:
+            print('❌ JSM connectivity failed: no Cloud ID')
+            return False
+        
+        # One authenticated request verifies reachability and credentials
+        response = await asyncio.to_thread(
+            service.session.get, f'{service.base_url}/{cloud_id}/v1/alerts',
+            headers=service.headers, params={'limit': 1}, timeout=10
+        )
+        response.raise_for_status()
+        print('✅ JSM connectivity successful')
+        return True
+    except Exception as e:
+        print(f'❌ JSM connectivity error: {e}')
+        return False
+
+result = asyncio.run(test())
+sys.exit(0 if result else 1)
+" 2>/dev/null; then
+    echo "✅ JSM connectivity test passed"
+else
+    echo "⚠️  JSM connectivity test failed, but deployment continues"
+fi
+
+echo ""
+echo "🎉 Deployment completed successfully!"
+echo ""
+echo "📋 Service URLs:"
+echo "   • Web Interface: http://localhost:3000"
+echo "   • API Documentation: http://localhost:8000/docs"
+echo "   • Health Check: http://localhost:8000/health"
+echo ""
+echo "🔧 Useful commands:"
+echo "   • View logs: docker-compose logs -f"
+echo "   • Stop services: docker-compose down"
+echo "   • Restart services: docker-compose restart"
+echo ""
+echo "📊 Monitor the application:"
+echo "   • Check logs: docker-compose logs -f backend"
+echo "   • View database: docker-compose exec postgres psql -U user alertdb"
+echo "   • Test API: curl http://localhost:8000/api/info"